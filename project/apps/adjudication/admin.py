@@ -28,6 +28,7 @@ from .models import Outcome
 from .models import Panelist
 from .models import Round
 from .models import Score
+from .models import Scoreboard
 from .models import Song
 
 admin.site.site_header = 'Barberscore Admin Backend'
@@ -301,6 +302,40 @@ class ScoreAdmin(admin.ModelAdmin):
     save_on_top = True
 
 
+@admin.register(Scoreboard)
+class ScoreboardAdmin(admin.ModelAdmin):
+    fields = [
+        'round',
+        'appearance',
+        'category',
+        'points',
+        'count',
+    ]
+
+    readonly_fields = [
+        'round',
+        'appearance',
+        'category',
+        'points',
+        'count',
+    ]
+
+    list_display = [
+        'appearance',
+        'category',
+        'points',
+        'count',
+    ]
+
+    list_filter = [
+        'category',
+    ]
+
+    search_fields = [
+        'id',
+    ]
+
+
 @admin.register(Song)
 class SongAdmin(admin.ModelAdmin):
     fields = [
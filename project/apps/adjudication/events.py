@@ -0,0 +1,84 @@
+# Standard Library
+import json
+import logging
+import threading
+import time
+
+# Third-Party
+from django_redis import get_redis_connection
+
+# Django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+# Streams hold a worker thread, so web runs gunicorn's gthread workers
+# (see Procfile) and each process serves at most MAX_STREAMS at once,
+# leaving the rest of its threads to the API.  Streams are cut after
+# STREAM_TIMEOUT; EventSource clients reconnect on their own.
+STREAM_TIMEOUT = 55
+KEEPALIVE = 15
+RECONNECT = 1000
+MAX_STREAMS = 4
+# Clients turned away wait longer before trying again
+BUSY_RECONNECT = 10000
+
+streams = threading.BoundedSemaphore(MAX_STREAMS)
+
+
+def get_channel(round_id):
+    return "round:{0}:events".format(round_id)
+
+
+def publish_event(round_id, kind, data):
+    """Publish a delta to a round's stream once the transaction commits."""
+    message = json.dumps(data, cls=DjangoJSONEncoder)
+
+    def publish():
+        get_redis_connection('default').publish(
+            get_channel(round_id),
+            "{0}\n{1}".format(kind, message),
+        )
+    transaction.on_commit(publish)
+    return
+
+
+def stream_events(round_id, timeout=STREAM_TIMEOUT):
+    """Yield server-sent events for a round until the timeout."""
+    if not streams.acquire(blocking=False):
+        yield "retry: {0}\n\n".format(BUSY_RECONNECT)
+        return
+    pubsub = None
+    try:
+        pubsub = get_redis_connection('default').pubsub(
+            ignore_subscribe_messages=True,
+        )
+        pubsub.subscribe(get_channel(round_id))
+        deadline = time.monotonic() + timeout
+        yield "retry: {0}\n\n".format(RECONNECT)
+        sent = time.monotonic()
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=1)
+            if message is None:
+                if time.monotonic() - sent >= KEEPALIVE:
+                    sent = time.monotonic()
+                    yield ": keepalive\n\n"
+                continue
+            kind, _, data = message['data'].decode().partition('\n')
+            sent = time.monotonic()
+            yield "event: {0}\ndata: {1}\n\n".format(kind, data)
+    finally:
+        if pubsub:
+            pubsub.close()
+        streams.release()
+
+
+def publish_score(round_id, score):
+    return publish_event(round_id, 'score', {
+        'id': score.id,
+        'status': score.status,
+        'points': score.points,
+        'song': score.song_id,
+        'panelist': score.panelist_id,
+    })
@@ -21,9 +21,12 @@ from django.core.validators import RegexValidator
 from django.core.validators import URLValidator
 from django.core.validators import validate_email
 from django.db import IntegrityError
+from django.db import transaction
 from django.db.models import CharField
+from django.db.models import Count
 from django.db.models import F
 from django.db.models import Manager
+from django.db.models import Sum
 from django.db.models import Value
 from django.db.models.functions import Concat
 from django.forms.models import model_to_dict
@@ -32,6 +35,7 @@ from django.utils.timezone import now
 
 # First-Party
 from phonenumber_field.validators import validate_international_phonenumber
+from .events import publish_score
 from .validators import validate_bhs_id
 from .validators import validate_tin
 from .validators import validate_url
@@ -50,6 +54,38 @@ validate_twitter = RegexValidator(
 )
 
 class AppearanceManager(Manager):
+    def update_stats(self, session_id):
+        # Recompute stats for every verified appearance in the session
+        Scoreboard = apps.get_model('adjudication.scoreboard')
+        rows = Scoreboard.objects.filter(
+            session_id=session_id,
+        ).values_list(
+            'group_id',
+            'round__num',
+            'category',
+            'points',
+            'count',
+        )
+        groups = {}
+        for group_id, num, category, points, count in rows:
+            groups.setdefault(group_id, []).append((num, category, points, count))
+        appearances = list(self.filter(
+            round__session_id=session_id,
+            stats__isnull=False,
+        ).select_related('round'))
+        for appearance in appearances:
+            appearance.stats = self.model.calculate_stats(
+                (category, points, count)
+                for num, category, points, count in groups.get(appearance.group_id, [])
+                if num <= appearance.round.num
+            )
+            appearance.modified = now()
+        self.bulk_update(appearances, [
+            'stats',
+            'modified',
+        ])
+        return len(appearances)
+
     def update_or_create_from_clean(self, item):
         Round = apps.get_model('adjudication.round')
         round = Round.objects.get(
@@ -70,6 +106,52 @@ class AppearanceManager(Manager):
         )
 
 
+class OutcomeManager(Manager):
+    def update_winners(self, round):
+        # Load every award and linked appearance once, then decide in memory
+        Appearance = apps.get_model('adjudication.appearance')
+        Award = apps.get_model('bhs.award')
+        outcomes = list(round.outcomes.all())
+        awards = Award.objects.in_bulk({x.award_id for x in outcomes})
+        links = Appearance.outcomes.through.objects.filter(
+            outcome__round=round,
+        ).values_list(
+            'outcome_id',
+            'appearance_id',
+        )
+        linked = {}
+        for outcome_id, appearance_id in links:
+            linked.setdefault(appearance_id, []).append(outcome_id)
+        # Best first, as .last() read the ascending order; num settles ties
+        appearances = Appearance.objects.filter(
+            id__in=list(linked),
+        ).only(
+            'id',
+            'name',
+            'stats',
+        ).order_by(
+            '-stats__tot_points',
+            '-stats__sng_points',
+            '-stats__per_points',
+            '-num',
+        )
+        members = {}
+        for appearance in appearances:
+            for outcome_id in linked[appearance.id]:
+                members.setdefault(outcome_id, []).append(appearance)
+        for outcome in outcomes:
+            outcome.winner = outcome.calculate_winner(
+                awards[outcome.award_id],
+                members.get(outcome.id, []),
+            )
+            outcome.modified = now()
+        self.bulk_update(outcomes, [
+            'winner',
+            'modified',
+        ])
+        return len(outcomes)
+
+
 class PanelistManager(Manager):
     def update_or_create_from_clean(self, item):
         Round = apps.get_model('adjudication.round')
@@ -117,6 +199,25 @@ class SongManager(Manager):
 
 
 class ScoreManager(Manager):
+    def update_points(self, round, scores, points):
+        # Bulk entry bypasses save(), so rebuild what the signal keeps current
+        Appearance = apps.get_model('adjudication.appearance')
+        Scoreboard = apps.get_model('adjudication.scoreboard')
+        for score in scores:
+            score.points = points[score.id]
+            score.modified = now()
+        with transaction.atomic():
+            self.bulk_update(scores, [
+                'points',
+                'modified',
+            ])
+            Scoreboard.objects.rebuild(round)
+            Appearance.objects.update_stats(round.session_id)
+            for score in scores:
+                score._loaded_points = score.points
+                publish_score(round.id, score)
+        return len(scores)
+
     def update_or_create_from_clean(self, item):
         song = item.cleansong.song
         panelist = item.cleanpanelist.panelist
@@ -128,3 +229,89 @@ class ScoreManager(Manager):
             panelist=panelist,
             defaults=defaults,
         )
+
+
+class ScoreboardManager(Manager):
+    def get_song(self, score):
+        Song = apps.get_model('adjudication.song')
+        return Song.objects.filter(
+            id=score.song_id,
+        ).values(
+            'appearance_id',
+            'appearance__group_id',
+            'appearance__round_id',
+            'appearance__round__session_id',
+        ).first()
+
+    def update_from_score(self, score, old, new, song=None):
+        Panelist = apps.get_model('adjudication.panelist')
+        # Nothing to do unless the contribution of the score changed
+        delta_points = (new or 0) - (old or 0)
+        delta_count = (new is not None) - (old is not None)
+        if not delta_points and not delta_count:
+            return
+        panelist = Panelist.objects.filter(
+            id=score.panelist_id,
+        ).values(
+            'kind',
+            'category',
+        ).first()
+        # Only official scores count towards the totals
+        if not panelist or panelist['kind'] != Panelist.KIND.official:
+            return
+        if song is None:
+            song = self.get_song(score)
+        if not song:
+            return
+        with transaction.atomic():
+            if new is not None:
+                self.get_or_create(
+                    appearance_id=song['appearance_id'],
+                    category=panelist['category'],
+                    defaults={
+                        'round_id': song['appearance__round_id'],
+                        'session_id': song['appearance__round__session_id'],
+                        'group_id': song['appearance__group_id'],
+                    },
+                )
+            # Removals never create a row; in a cascade it may be gone already
+            self.filter(
+                appearance_id=song['appearance_id'],
+                category=panelist['category'],
+            ).update(
+                points=F('points') + delta_points,
+                count=F('count') + delta_count,
+            )
+        return
+
+    def rebuild(self, round):
+        # Recompute a round from the scores, for writes that bypass save()
+        Score = apps.get_model('adjudication.score')
+        Panelist = apps.get_model('adjudication.panelist')
+        rows = Score.objects.filter(
+            song__appearance__round=round,
+            panelist__kind=Panelist.KIND.official,
+            points__isnull=False,
+        ).values(
+            'song__appearance_id',
+            'song__appearance__group_id',
+            'panelist__category',
+        ).annotate(
+            tot_points=Sum('points'),
+            tot_count=Count('points'),
+        ).order_by()
+        scoreboards = [
+            self.model(
+                appearance_id=row['song__appearance_id'],
+                group_id=row['song__appearance__group_id'],
+                category=row['panelist__category'],
+                round_id=round.id,
+                session_id=round.session_id,
+                points=row['tot_points'],
+                count=row['tot_count'],
+            ) for row in rows
+        ]
+        with transaction.atomic():
+            self.filter(round=round).delete()
+            self.bulk_create(scoreboards)
+        return len(scoreboards)
@@ -0,0 +1,71 @@
+# Generated by Django 2.2.12 on 2020-04-14 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+import uuid
+
+
+def forwards(apps, schema_editor):
+    Round = apps.get_model('adjudication', 'Round')
+    Score = apps.get_model('adjudication', 'Score')
+    Scoreboard = apps.get_model('adjudication', 'Scoreboard')
+    sessions = dict(Round.objects.values_list('id', 'session_id'))
+    rows = Score.objects.filter(
+        panelist__kind=10,
+        points__isnull=False,
+    ).values(
+        'song__appearance_id',
+        'song__appearance__group_id',
+        'song__appearance__round_id',
+        'panelist__category',
+    ).annotate(
+        tot_points=Sum('points'),
+        tot_count=Count('points'),
+    ).order_by()
+    Scoreboard.objects.bulk_create([
+        Scoreboard(
+            appearance_id=row['song__appearance_id'],
+            group_id=row['song__appearance__group_id'],
+            round_id=row['song__appearance__round_id'],
+            session_id=sessions[row['song__appearance__round_id']],
+            category=row['panelist__category'],
+            points=row['tot_points'],
+            count=row['tot_count'],
+        ) for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adjudication', '0012_auto_20190927_0625'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Scoreboard',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('category', models.IntegerField(choices=[(5, 'DRCJ'), (10, 'CA'), (30, 'Music'), (40, 'Performance'), (50, 'Singing')])),
+                ('points', models.IntegerField(default=0, help_text='\n            The running total of official points.')),
+                ('count', models.IntegerField(default=0, help_text='\n            The number of official scores in the total.')),
+                ('session_id', models.UUIDField(blank=True, null=True)),
+                ('group_id', models.UUIDField(blank=True, null=True)),
+                ('appearance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboards', to='adjudication.Appearance')),
+                ('round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoreboards', to='adjudication.Round')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='scoreboard',
+            index=models.Index(fields=['session_id', 'group_id'], name='scoreboard_session_group'),
+        ),
+        migrations.AddConstraint(
+            model_name='scoreboard',
+            constraint=models.UniqueConstraint(fields=('appearance', 'category'), name='unique_scoreboard'),
+        ),
+        migrations.RunPython(
+            forwards,
+            migrations.RunPython.noop,
+        ),
+    ]
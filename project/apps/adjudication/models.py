@@ -4,6 +4,7 @@ import datetime
 import logging
 import uuid
 from random import randint
+from random import shuffle
 from io import BytesIO
 from timezone_field import TimeZoneField
 import json
@@ -34,6 +35,9 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.core.files.base import ContentFile
 from django.db import models
 from django.db.models import F, Window
+from django.db.models import Case
+from django.db.models import Value
+from django.db.models import When
 from django.template.loader import render_to_string
 from django.utils.functional import cached_property
 from django.conf import settings
@@ -50,15 +54,22 @@ from .tasks import save_psa_from_panelist
 from .tasks import send_complete_email_from_appearance
 from .tasks import save_reports_from_round
 
+from .events import publish_event
+from .snapshots import delete_snapshots
+
 from .fields import UploadPath
 from .fields import LowerEmailField
 from .fields import DivisionsField
 
+from apps.bhs.permissions import get_permissions
+
 
 from .managers import AppearanceManager
+from .managers import OutcomeManager
 from .managers import PanelistManager
 from .managers import SongManager
 from .managers import ScoreManager
+from .managers import ScoreboardManager
 
 log = logging.getLogger(__name__)
 
@@ -423,10 +434,9 @@ class Appearance(TimeStampedModel):
             'last_name',
             # 'person__last_name',
         )
+        songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
         variances = []
         for song in songs:
-            chart = Chart.objects.get(id=song.chart_id)
-            song.chart_patched = chart
             variances.extend(song.dixons)
             variances.extend(song.asterisks)
         variances = list(set(variances))
@@ -511,94 +521,82 @@ class Appearance(TimeStampedModel):
             return
 
     def check_variance(self):
-        # Set flag
+        Panelist = apps.get_model('adjudication.panelist')
+        Score = apps.get_model('adjudication.score')
+        Song = apps.get_model('adjudication.song')
+        # Load every official score for the appearance at once
+        scores = {}
+        rows = Score.objects.filter(
+            song__appearance=self,
+            panelist__kind=Panelist.KIND.official,
+        ).values_list(
+            'song_id',
+            'panelist__category',
+            'points',
+        )
+        for song_id, category, points in rows:
+            scores.setdefault(song_id, []).append((category, points))
+        # Run checks for all songs in memory and save together.
         variance = False
-        # Run checks for all songs and save.
-        for song in self.songs.all():
-            asterisks = song.get_asterisks()
-            if asterisks:
-                song.asterisks = asterisks
-                variance = True
-            dixons = song.get_dixons()
-            if dixons:
-                song.dixons = dixons
+        songs = list(self.songs.all())
+        for song in songs:
+            song.asterisks = Song.calculate_asterisks(scores.get(song.id, []))
+            song.dixons = Song.calculate_dixons(scores.get(song.id, []))
+            song.modified = now()
+            if song.asterisks or song.dixons:
                 variance = True
-            if variance:
-                song.save()
+        Song.objects.bulk_update(songs, [
+            'asterisks',
+            'dixons',
+            'modified',
+        ])
         return variance
 
     def get_stats(self):
-        Round = apps.get_model('adjudication.round')
-        rounds = Round.objects.filter(
+        Scoreboard = apps.get_model('adjudication.scoreboard')
+        # Cumulative across the session up to this round
+        rows = Scoreboard.objects.filter(
             session_id=self.round.session_id,
+            group_id=self.group_id,
+            round__num__lte=self.round.num,
+        ).values_list(
+            'category',
+            'points',
+            'count',
         )
-        stats = rounds.aggregate(
-            tot_points=Sum(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            sng_points=Sum(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.singing,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            per_points=Sum(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.performance,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            mus_points=Sum(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.music,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            tot_score=Avg(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            sng_score=Avg(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.singing,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            per_score=Avg(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.performance,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-            mus_score=Avg(
-                'appearances__songs__scores__points',
-                filter=Q(
-                    appearances__songs__scores__panelist__kind=Panelist.KIND.official,
-                    appearances__songs__scores__panelist__category=Panelist.CATEGORY.music,
-                    appearances__group_id=self.group_id,
-                ),
-            ),
-        )
-        for key, value in stats.items():
-            if key.endswith('_score'):
-                stats[key] = rnd(value, 1)
+        return self.calculate_stats(rows)
+
+    @staticmethod
+    def calculate_stats(rows):
+        """
+        Stats from (category, points, count) rows of official scores.
+        """
+        Panelist = apps.get_model('adjudication.panelist')
+        points = {}
+        counts = {}
+        for category, total, count in rows:
+            if count:
+                points[category] = points.get(category, 0) + total
+                counts[category] = counts.get(category, 0) + count
+        categories = [
+            ('sng', Panelist.CATEGORY.singing),
+            ('per', Panelist.CATEGORY.performance),
+            ('mus', Panelist.CATEGORY.music),
+        ]
+        stats = {
+            'tot_points': sum(points.values()) if points else None,
+        }
+        for prefix, category in categories:
+            stats['{0}_points'.format(prefix)] = points.get(category)
+        if counts:
+            stats['tot_score'] = rnd(sum(points.values()) / sum(counts.values()), 1)
+        else:
+            stats['tot_score'] = None
+        for prefix, category in categories:
+            if category in counts:
+                stats['{0}_score'.format(prefix)] = rnd(points[category] / counts[category], 1)
+            else:
+                stats['{0}_score'.format(prefix)] = None
         return stats
 
     def get_csa(self):
@@ -796,12 +794,8 @@ class Appearance(TimeStampedModel):
                     ),
                 ),
             )
+            songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
             for song in songs:
-                try:
-                    chart = Chart.objects.get(id=song.chart_id)
-                except Chart.DoesNotExist:
-                    chart = None
-                song.chart_patched = chart
                 penalties_map = {
                     30: "†",
                     32: "‡",
@@ -850,12 +844,8 @@ class Appearance(TimeStampedModel):
             'appearance__round__kind',
             'num',
         )
+        songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
         for song in songs:
-            try:
-                chart = Chart.objects.get(id=song.chart_id)
-            except Chart.DoesNotExist:
-                chart = None
-            song.chart_patched = chart
             scores = song.scores.filter(
                 panelist__kind=Panelist.KIND.official,
             ).order_by('panelist__num')
@@ -1125,9 +1115,8 @@ class Appearance(TimeStampedModel):
                     ),
                 ),
             )
+            songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
             for song in songs:
-                chart = Chart.objects.get(id=song.chart_id)
-                song.chart_patched = chart
                 penalties_map = {
                     30: "†",
                     32: "‡",
@@ -1191,25 +1180,20 @@ class Appearance(TimeStampedModel):
     def has_object_read_permission(self, request):
         if self.round.status == self.round.STATUS.published:
             return True
-        return request.user in self.round.owners.all()
+        return get_permissions(request).owns(self, 'round')
 
     @staticmethod
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         if self.round.status == self.round.STATUS.published:
             return False
-        return request.user in self.round.owners.all()
+        return get_permissions(request).owns(self, 'round')
 
     # Appearance Conditions
     def can_verify(self):
@@ -1238,19 +1222,24 @@ class Appearance(TimeStampedModel):
     def build(self, *args, **kwargs):
         """Sets up the Appearance."""
         Panelist = apps.get_model('adjudication.panelist')
-        panelists = self.round.panelists.filter(
+        Song = apps.get_model('adjudication.song')
+        Score = apps.get_model('adjudication.score')
+        panelists = list(self.round.panelists.filter(
             category__gt=Panelist.CATEGORY.ca,
-        )
-        i = 1
-        while i <= 2:  # Number songs constant
-            song = self.songs.create(
-                num=i
-            )
-            for panelist in panelists:
-                song.scores.create(
-                    panelist=panelist,
-                )
-            i += 1
+        ))
+        songs = [
+            Song(
+                appearance=self,
+                num=num,
+            ) for num in [1, 2]  # Number songs constant
+        ]
+        Song.objects.bulk_create(songs)
+        Score.objects.bulk_create([
+            Score(
+                song=song,
+                panelist=panelist,
+            ) for song in songs for panelist in panelists
+        ])
         return
 
     @fsm_log_by
@@ -1593,12 +1582,28 @@ class Outcome(TimeStampedModel):
         related_query_name='outcomes',
     )
 
+    # Outcome Internals
+    objects = OutcomeManager()
+
     # Methods
     def get_winner(self):
         Award = apps.get_model('bhs.award')
-        Group = apps.get_model('bhs.group')
-        Panelist = apps.get_model('adjudication.panelist')
         award = Award.objects.get(id=self.award_id)
+        appearances = self.appearances.only(
+            'id',
+            'name',
+            'stats',
+        ).order_by(
+            '-stats__tot_points',
+            '-stats__sng_points',
+            '-stats__per_points',
+            '-num',
+        )
+        return self.calculate_winner(award, appearances)
+
+    def calculate_winner(self, award, appearances):
+        # Works from the given award and appearances so a round can be run in one pass;
+        # appearances come best first, and the first of a tie wins
         if self.round.kind != self.round.KIND.finals and not award.is_single:
             return "(Result determined in Finals)"
         if award.level == award.LEVEL.deferred:
@@ -1684,11 +1689,11 @@ class Outcome(TimeStampedModel):
         #     ).first().name
         if award.level == award.LEVEL.qualifier:
             threshold = award.threshold
-            winners = self.appearances.filter(
-                stats__tot_score__gte=threshold,
-            ).order_by(
-                'name',
-            ).values_list('name', flat=True)
+            winners = sorted(
+                x.name for x in appearances
+                if (x.stats or {}).get('tot_score') is not None
+                and x.stats['tot_score'] >= threshold
+            )
 
             # group_ids = self.contenders.filter(
             #     status__gt=0,
@@ -1722,11 +1727,16 @@ class Outcome(TimeStampedModel):
                 return ", ".join(qualifiers)
             return "(No Qualifiers)"
         if award.level in [award.LEVEL.championship, award.LEVEL.representative]:
-            winner = self.appearances.order_by(
-                'stats__tot_points',
-                'stats__sng_points',
-                'stats__per_points',
-            ).last()
+            scored = [x for x in appearances if x.stats]
+            winner = max(
+                scored,
+                key=lambda x: (
+                    x.stats.get('tot_points') or 0,
+                    x.stats.get('sng_points') or 0,
+                    x.stats.get('per_points') or 0,
+                ),
+                default=None,
+            )
             # winner = Group.objects.get(id=group_id)
             # winner = Group.objects.filter(
             #     appearances__contenders__outcome=self,
@@ -1789,18 +1799,13 @@ class Outcome(TimeStampedModel):
     def has_object_read_permission(self, request):
         if self.round.status == self.round.STATUS.published:
             return True
-        return request.user.id in self.round.owners.all()
+        return get_permissions(request).owns(self, 'round')
 
     @staticmethod
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
 
     @allow_staff_or_superuser
@@ -1808,7 +1813,7 @@ class Outcome(TimeStampedModel):
     def has_object_write_permission(self, request):
         if self.round.status == self.round.STATUS.published:
             return False
-        return request.user in self.round.owners.all()
+        return get_permissions(request).owns(self, 'round')
 
 
 class Panelist(TimeStampedModel):
@@ -2003,6 +2008,17 @@ class Panelist(TimeStampedModel):
         #     self.person,
         # )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the stored panel so the scoreboard can follow a change
+        if 'kind' in field_names and 'category' in field_names:
+            instance._loaded_panel = (
+                values[field_names.index('kind')],
+                values[field_names.index('category')],
+            )
+        return instance
+
     def clean(self):
         if self.kind > self.KIND.practice:
             raise ValidationError(
@@ -2037,22 +2053,12 @@ class Panelist(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
         # if self.round.status >= self.round.STATUS.started:
         #     return request.user in self.round.owners.all()
 
@@ -2158,9 +2164,8 @@ class Panelist(TimeStampedModel):
                         ),
                     ),
                 )
+                songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
                 for song in songs:
-                    chart = Chart.objects.get(id=song.chart_id)
-                    song.chart_patched = chart
                     scores2 = song.scores.select_related(
                         'panelist',
                     ).filter(
@@ -2734,6 +2739,7 @@ class Round(TimeStampedModel):
 
         # Monkeypatching
         i = self.spots
+        publics = Group.objects.attach(publics, 'group_id', 'group_patched')
         for public in publics:
             i += 1
             public.tot_rank = i
@@ -2847,7 +2853,7 @@ class Round(TimeStampedModel):
             public.contesting_patched = ", ".join([str(x) for x in contesting])
             public.pos_patched = public.pos
             public.participants_patched = public.participants
-            group = Group.objects.get(id=public.group_id)
+            group = public.group_patched
             public.district = group.district
             public.name = group.name
 
@@ -2907,18 +2913,21 @@ class Round(TimeStampedModel):
                 'draw',
                 'group_id',
             )
+            mt_ids = list(self.appearances.filter(
+                draw=0,
+            ).values_list(
+                'group_id',
+                flat=True,
+            )[:1])
+            names = Group.objects.in_bulk(
+                [x[1] for x in advancer_group_ids] + mt_ids
+            )
             advancers = []
             for draw, group_id in advancer_group_ids:
-                name = Group.objects.get(id=group_id).name
+                name = names[group_id].name
                 advancers.append((draw, name))
-            try:
-                mt_id = self.appearances.get(
-                    draw=0,
-                ).group_id
-                mt = Group.objects.get(id=mt_id).name
-                advancers.append(('MT', mt))
-            except self.appearances.model.DoesNotExist:
-                pass
+            for mt_id in mt_ids:
+                advancers.append(('MT', names[mt_id].name))
         else:
             advancers = None
 
@@ -3000,12 +3009,12 @@ class Round(TimeStampedModel):
                 page_size = 'Letter'
         else:
             if self.kind == self.KIND.finals:
-                if publics.count() >= 10:
+                if len(publics) >= 10:
                     page_size = 'Legal'
                 else:
                     page_size = 'Letter'
             elif self.kind == self.KIND.semis:
-                if publics.count() >= 12:
+                if len(publics) >= 12:
                     page_size = 'Legal'
                 else:
                     page_size = 'Letter'
@@ -3815,9 +3824,8 @@ class Round(TimeStampedModel):
                         ),
                     ),
                 )
+                songs = Chart.objects.attach(songs, 'chart_id', 'chart_patched')
                 for song in songs:
-                    chart = Chart.objects.get(id=song.chart_id)
-                    song.chart_patched = chart
                     penalties_map = {
                         30: "†",
                         32: "‡",
@@ -4043,23 +4051,28 @@ class Round(TimeStampedModel):
         Song = apps.get_model('adjudication.song')
         appearances = self.appearances.filter(
             draw__gt=0,
+        ).prefetch_related(
+            models.Prefetch(
+                'songs',
+                queryset=Song.objects.order_by('num'),
+            ),
         ).order_by(
             'draw',
         )
+        Chart.objects.attach(
+            [song for appearance in appearances for song in appearance.songs.all()],
+            'chart_id',
+            'chart_patched',
+        )
         for appearance in appearances:
-            songs = appearance.songs.order_by('num')
             titles = []
-            for song in songs:
-                try:
-                    chart = Chart.objects.get(id=song.chart_id)
-                except Chart.DoesNotExist:
-                    chart = None
+            for song in appearance.songs.all():
                 try:
-                    title = chart.title
+                    title = song.chart_patched.title
                 except AttributeError:
                     title = "Unknown (Not in Repertory)"
                 row = "{0} Song {1}: {2}".format(
-                    song.appearance.round.get_kind_display(),
+                    self.get_kind_display(),
                     song.num,
                     title,
                 )
@@ -4207,19 +4220,27 @@ class Round(TimeStampedModel):
             document.add_paragraph(
                 "Total participants on stage: {0}".format(pos)
             )
+        # Resolve awards and groups up front
+        outcomes = Award.objects.attach(outcomes, 'award_id', 'award_patched')
+        appearances = list(appearances)
+        Group.objects.attach(
+            appearances + [x for x in [mt] if x] + (winners or []),
+            'group_id',
+            'group_patched',
+        )
         document.add_heading('Awards')
         for outcome in outcomes:
-            award = Award.objects.get(id=outcome.award_id)
+            award = outcome.award_patched
             document.add_paragraph("{0}: {1}".format(award.name, outcome.winner))
         if appearances:
             document.add_heading('Draw')
             for appearance in appearances:
-                group = Group.objects.get(id=appearance.group_id)
+                group = appearance.group_patched
                 document.add_paragraph(
                     "{0}: {1}".format(appearance.draw, group.name),
                     # style='List Bullet',
                 )
-            gp = Group.objects.get(id=mt.group_id)
+            gp = mt.group_patched
             document.add_paragraph(
                 "MT: {0}".format(gp.name),
                 # style='List Bullet',
@@ -4227,7 +4248,7 @@ class Round(TimeStampedModel):
         if winners:
             document.add_heading('Results')
             for winner in winners:
-                group = Group.objects.get(id=winner.group_id)
+                group = winner.group_patched
                 document.add_paragraph(
                     "With a score of {0}, a {1} average: {2}".format(
                         winner.stats['tot_points'],
@@ -4438,12 +4459,7 @@ class Round(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
     @allow_staff_or_superuser
     @authenticated_users
@@ -4451,7 +4467,7 @@ class Round(TimeStampedModel):
         if self.status == self.STATUS.published:
             return False
         return bool(any([
-            request.user in self.owners.all(),
+            get_permissions(request).owns(self),
         ]))
 
     # Round Conditions
@@ -4488,6 +4504,7 @@ class Round(TimeStampedModel):
         target=STATUS.new,
     )
     def reset(self, *args, **kwargs):
+        delete_snapshots(self)
         self.oss_report.delete()
         self.sa_report.delete()
         panelists = self.panelists.all()
@@ -4515,6 +4532,9 @@ class Round(TimeStampedModel):
         Assignment = apps.get_model('registration.assignment')
         Entry = apps.get_model('registration.entry')
         Round = apps.get_model('adjudication.round')
+        Appearance = apps.get_model('adjudication.appearance')
+        Outcome = apps.get_model('adjudication.outcome')
+        Panelist = apps.get_model('adjudication.panelist')
         Chart = apps.get_model('bhs.chart')
 
         # Get objects for build
@@ -4568,55 +4588,34 @@ class Round(TimeStampedModel):
             'first_name',
         )
 
+        # Build every row in memory, then write each table once.
+        panelists = []
         for ca in cas:
-            area = ca.get_district_display() if ca.district else ''
-            self.panelists.create(
-                kind=ca.kind,
-                category=ca.category,
-                person_id=ca.person_id,
-                name=ca.name,
-                first_name=ca.first_name,
-                last_name=ca.last_name,
-                area=area,
-                email=ca.email,
-                cell_phone=ca.cell_phone,
-                bhs_id=ca.bhs_id,
-            )
-
+            panelists.append((None, ca))
         i = 0
         for judge in judges:
             i += 1
-            area = judge.get_district_display() if judge.district else ''
-            self.panelists.create(
-                num=i,
-                kind=judge.kind,
-                category=judge.category,
-                person_id=judge.person_id,
-                name=judge.name,
-                first_name=judge.first_name,
-                last_name=judge.last_name,
-                area=area,
-                email=judge.email,
-                cell_phone=judge.cell_phone,
-                bhs_id=judge.bhs_id,
-            )
+            panelists.append((i, judge))
         i = 50
         for practice in practices:
             i += 1
-            area = practice.get_district_display() if practice.district else ''
-            self.panelists.create(
-                num=i,
-                kind=practice.kind,
-                category=practice.category,
-                person_id=practice.person_id,
-                name=practice.name,
-                first_name=practice.first_name,
-                last_name=practice.last_name,
-                area=area,
-                email=practice.email,
-                cell_phone=practice.cell_phone,
-                bhs_id=practice.bhs_id,
-            )
+            panelists.append((i, practice))
+        Panelist.objects.bulk_create([
+            Panelist(
+                round=self,
+                num=num,
+                kind=assignment.kind,
+                category=assignment.category,
+                person_id=assignment.person_id,
+                name=assignment.name,
+                first_name=assignment.first_name,
+                last_name=assignment.last_name,
+                area=assignment.get_district_display() if assignment.district else '',
+                email=assignment.email,
+                cell_phone=assignment.cell_phone,
+                bhs_id=assignment.bhs_id,
+            ) for num, assignment in panelists
+        ])
 
         # Build Outcomes (Awards)
         if not prior_round:
@@ -4632,6 +4631,7 @@ class Round(TimeStampedModel):
             contests = prior_round.outcomes.filter(
                 is_single=False,
             )
+        outcomes = []
         i = 0
         for contest in contests:
             # Only number contests on initial; otherwise use existing.
@@ -4640,7 +4640,8 @@ class Round(TimeStampedModel):
                 num = contest.num
             else:
                 num = i
-            self.outcomes.create(
+            outcomes.append(Outcome(
+                round=self,
                 num=num,
                 award_id=contest.award_id,
                 name=contest.name,
@@ -4653,34 +4654,48 @@ class Round(TimeStampedModel):
                 age=contest.age,
                 is_novice=contest.is_novice,
                 is_single=contest.is_single,
-            )
+            ))
+        Outcome.objects.bulk_create(outcomes)
+        outcomes = {x.award_id: x for x in outcomes}
 
         # Create Appearances
+        appearances = []
+        owners = []
+        links = []
         if not prior_round:
             # If first round, build appearances from entries
             entries = session.entries.filter(
                 status=Entry.STATUS.approved,
+            ).prefetch_related(
+                'owners',
+                'contests',
             ).order_by('draw')
+            group_ids = [x.group_id for x in entries]
+            charts_raw = Chart.objects.filter(
+                groups__id__in=group_ids,
+            ).values(
+                'groups__id',
+                'id',
+                'title',
+                'arrangers',
+            )
+            charts = {}
+            for c in charts_raw:
+                group_id = c.pop('groups__id')
+                c['pk'] = str(c.pop('id'))
+                charts.setdefault(group_id, []).append(json.dumps(c))
             for entry in entries:
                 # Force draw = 0 for MTs
                 if entry.is_mt:
                     entry.draw = 0
-                is_single = not bool(entry.contests.filter(is_single=False))
-                charts_raw = Chart.objects.filter(
-                    groups__id=entry.group_id,
-                ).values(
-                    'id',
-                    'title',
-                    'arrangers',
-                )
-                for c in charts_raw:
-                    c['pk'] = str(c.pop('id'))
-                charts = [json.dumps(x) for x in charts_raw]
+                contests = entry.contests.all()
+                is_single = all(x.is_single for x in contests)
                 if entry.kind == entry.KIND.quartet:
                     area = entry.get_district_display()
                 else:
                     area = entry.chapters
-                appearance = self.appearances.create(
+                appearance = Appearance(
+                    round=self,
                     num=entry.draw,
                     is_private=entry.is_private,
                     is_single=is_single,
@@ -4696,21 +4711,29 @@ class Round(TimeStampedModel):
                     code=entry.code,
                     base=entry.base,
                     image_id=entry.image_id,
-                    charts=charts,
+                    charts=charts.get(entry.group_id, []),
                 )
-                appearance.owners.set(entry.owners.all())
-                award_ids = list(entry.contests.values_list('award_id', flat=True))
-                outcomes = self.outcomes.filter(award_id__in=award_ids)
-                appearance.outcomes.set(outcomes)
+                appearances.append(appearance)
+                owners.extend((appearance, x) for x in entry.owners.all())
+                links.extend((appearance, x.award_id) for x in contests)
         else:
             # If subsequent round, build appearances based on
-            # ADVANCERS from prior round.
-            prior_appearances = prior_round.appearances.filter(
+            # ADVANCERS from prior round, then the MT
+            prior_appearances = list(prior_round.appearances.filter(
                 status=Appearance.STATUS.advanced,
-            )
+            ).prefetch_related(
+                'owners',
+                'outcomes',
+            ))
+            prior_appearances += list(prior_round.appearances.filter(
+                draw__lte=0,
+            ).prefetch_related(
+                'owners',
+                'outcomes',
+            ))
             for prior_appearance in prior_appearances:
-                # Create and start group
-                appearance = self.appearances.create(
+                appearance = Appearance(
+                    round=self,
                     num=prior_appearance.draw,
                     is_private=prior_appearance.is_private,
                     is_single=prior_appearance.is_single,
@@ -4728,52 +4751,80 @@ class Round(TimeStampedModel):
                     image_id=prior_appearance.image_id,
                     charts=prior_appearance.charts,
                 )
-                appearance.owners.set(prior_appearance.owners.all())
-                award_ids = list(prior_appearance.outcomes.values_list('award_id', flat=True))
-                outcomes = self.outcomes.filter(
-                    award_id__in=award_ids
-                )
-                appearance.outcomes.set(outcomes)
-            # Create MT
-            mts = prior_round.appearances.filter(
-                draw__lte=0,
-            )
-            for mt in mts:
-                appearance = self.appearances.create(
-                    num=mt.draw,
-                    is_private=mt.is_private,
-                    is_single=mt.is_single,
-                    participants=mt.participants,
-                    area=mt.area,
-                    group_id=mt.group_id,
-                    name=mt.name,
-                    kind=mt.kind,
-                    gender=mt.gender,
-                    district=mt.district,
-                    division=mt.division,
-                    bhs_id=mt.bhs_id,
-                    code=mt.code,
-                    base=mt.base,
-                    image_id=mt.image_id,
-                    charts=mt.charts,
-                )
-                appearance.owners.set(mt.owners.all())
-                award_ids = list(mt.outcomes.values_list('award_id', flat=True))
-                outcomes = self.outcomes.filter(
-                    award_id__in=award_ids
-                )
-                appearance.outcomes.set(outcomes)
-            return
+                appearances.append(appearance)
+                owners.extend((appearance, x) for x in prior_appearance.owners.all())
+                links.extend((appearance, x.award_id) for x in prior_appearance.outcomes.all())
+        Appearance.objects.bulk_create(appearances)
+
+        # Link owners and outcomes through the join tables
+        Appearance.owners.through.objects.bulk_create([
+            Appearance.owners.through(
+                appearance_id=appearance.id,
+                user_id=user.id,
+            ) for appearance, user in owners
+        ], ignore_conflicts=True)
+        Appearance.outcomes.through.objects.bulk_create([
+            Appearance.outcomes.through(
+                appearance_id=appearance.id,
+                outcome_id=outcomes[award_id].id,
+            ) for appearance, award_id in links if award_id in outcomes
+        ], ignore_conflicts=True)
+        return
 
 
     @fsm_log_by
     @transition(field=status, source=[STATUS.built], target=STATUS.started)
     def start(self, *args, **kwargs):
-        # Build the appearances
-        appearances = self.appearances.all()
+        # Build the appearances in bulk; equivalent to Appearance.build()
+        Appearance = apps.get_model('adjudication.appearance')
+        Panelist = apps.get_model('adjudication.panelist')
+        Song = apps.get_model('adjudication.song')
+        Score = apps.get_model('adjudication.score')
+        ContentType = apps.get_model('contenttypes.contenttype')
+        appearances = list(self.appearances.filter(
+            status=Appearance.STATUS.new,
+        ))
+        panelists = list(self.panelists.filter(
+            category__gt=Panelist.CATEGORY.ca,
+        ))
+        songs = [
+            Song(
+                appearance=appearance,
+                num=num,
+            ) for appearance in appearances for num in [1, 2]  # Number songs constant
+        ]
+        Song.objects.bulk_create(songs)
+        Score.objects.bulk_create([
+            Score(
+                song=song,
+                panelist=panelist,
+            ) for song in songs for panelist in panelists
+        ])
+        self.appearances.filter(
+            id__in=[x.id for x in appearances],
+        ).update(
+            status=Appearance.STATUS.built,
+            modified=now(),
+        )
+        # One log entry per appearance, as the transition would write
+        content_type = ContentType.objects.get_for_model(Appearance)
+        StateLog.objects.bulk_create([
+            StateLog(
+                by=kwargs.get('by'),
+                source_state=Appearance.STATUS.new,
+                state=Appearance.STATUS.built,
+                transition='build',
+                content_type=content_type,
+                object_id=appearance.id,
+            ) for appearance in appearances
+        ])
+        # The update fires no post_transition, so publish what it would
         for appearance in appearances:
-            appearance.build()
-            appearance.save()
+            publish_event(self.id, 'appearance', {
+                'id': appearance.id,
+                'status': Appearance.STATUS.built,
+                'transition': 'build',
+            })
         return
 
     @fsm_log_by
@@ -4784,12 +4835,12 @@ class Round(TimeStampedModel):
         conditions=[can_complete],)
     def complete(self, *args, **kwargs):
         Appearance = apps.get_model('adjudication.appearance')
+        Outcome = apps.get_model('adjudication.outcome')
         Panelist = apps.get_model('adjudication.panelist')
+        # Refresh stats to pick up any corrections since verification
+        Appearance.objects.update_stats(self.session_id)
         # Run outcomes
-        outcomes = self.outcomes.all()
-        for outcome in outcomes:
-            outcome.winner = outcome.get_winner()
-            outcome.save()
+        Outcome.objects.update_winners(self)
 
         # If there is no next round simply return
         if self.kind == self.KIND.finals:
@@ -4799,101 +4850,83 @@ class Round(TimeStampedModel):
         # First, get spots available
         spots = self.spots
 
-        # Get all multi appearances and annotate average.
-        multis = self.appearances.filter(
+        # Rank all multi appearances from the scoreboard in a single pass,
+        # flagging those at or above 75.0 along the way.
+        ranked = list(self.appearances.filter(
             status=Appearance.STATUS.verified,
             is_single=False,
         ).annotate(
-            avg=Avg(
-                'songs__scores__points',
-                filter=Q(
-                    songs__scores__panelist__kind=Panelist.KIND.official,
-                )
-            ),
-            tot_points=Sum(
-                'songs__scores__points',
-                filter=Q(
-                    songs__scores__panelist__kind=Panelist.KIND.official,
-                )
-            ),
+            tot_count=Sum('scoreboards__count'),
+            tot_points=Sum('scoreboards__points'),
             sng_points=Sum(
-                'songs__scores__points',
+                'scoreboards__points',
                 filter=Q(
-                    songs__scores__panelist__kind=Panelist.KIND.official,
-                    songs__scores__panelist__category=Panelist.CATEGORY.singing,
+                    scoreboards__category=Panelist.CATEGORY.singing,
                 )
             ),
             per_points=Sum(
-                'songs__scores__points',
+                'scoreboards__points',
                 filter=Q(
-                    songs__scores__panelist__kind=Panelist.KIND.official,
-                    songs__scores__panelist__category=Panelist.CATEGORY.performance,
+                    scoreboards__category=Panelist.CATEGORY.performance,
                 )
             ),
-        )
+        ).annotate(
+            is_automatic=Case(
+                When(
+                    tot_points__gte=F('tot_count') * 75,
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+            rank=Window(
+                expression=RowNumber(),
+                order_by=[
+                    F('tot_points').desc(nulls_last=True),
+                    F('sng_points').desc(nulls_last=True),
+                    F('per_points').desc(nulls_last=True),
+                    F('num').asc(),
+                ],
+            ),
+        ).order_by('rank'))
         # If spots are constricted, find those who advance
         if spots:
-            # All those above 75.0 advance automatically, regardless of spots available
             if self.get_district_display() == 'BHS':
-                ordered = multis.order_by(
-                    '-tot_points',
-                    '-sng_points',
-                    '-per_points',
-                )
-                advancer__ids = [x.id for x in ordered[:spots]]
-                mt = ordered[spots:spots+1][0]
+                advancers = ranked[:spots]
+                remains = ranked[spots:]
             else:
-                automatics = multis.filter(
-                    avg__gte=75.0,
-                )
-                # generate list of the advancers, as appearance IDs
-                advancer__ids = [x.id for x in automatics]
-                # Generate remaining multi appearances
-                remains = multis.exclude(
-                    id__in=advancer__ids,
-                ).order_by(
-                    '-tot_points',
-                    '-sng_points',
-                    '-per_points',
-                )
-                # Figure out remaining spots
-                diff = spots - automatics.count()
+                # All those above 75.0 advance automatically, regardless of spots available
+                advancers = [x for x in ranked if x.is_automatic]
+                remains = [x for x in ranked if not x.is_automatic]
                 # If there are additional remaining spots, add them up to available
+                diff = spots - len(advancers)
                 if diff > 0:
-                    adds = remains[:diff]
-                    for a in adds:
-                        advancer__ids.append(a.id)
-                    try:
-                        mt = remains[diff:diff+1][0]
-                    except IndexError:
-                        mt = None
-                else:
-                    # If MT available add, otherwise none
-                    try:
-                        mt = remains.first()
-                    except AttributeError:
-                        mt = None
+                    advancers.extend(remains[:diff])
+                    remains = remains[diff:]
+            # The next in line is the Mic Tester
+            mt = remains[0] if remains else None
         # Otherwise, advance all
         else:
-            advancer__ids = [a.id for a in multis]
+            advancers = ranked
             mt = None
 
         # Reset draw
         self.appearances.update(draw=None)
 
-        # Randomize the advancers and set the initial draw
-        appearances = self.appearances.filter(
-            id__in=advancer__ids,
-        ).order_by('?')
-        i = 1
-        for appearance in appearances:
+        # Randomize the advancers and set the initial draw, with the
+        # Mic Tester at draw 0
+        shuffle(advancers)
+        for i, appearance in enumerate(advancers, start=1):
             appearance.draw = i
-            appearance.save()
-            i += 1
-        # create Mic Tester at draw 0
         if mt:
             mt.draw = 0
-            mt.save()
+            advancers.append(mt)
+        for appearance in advancers:
+            appearance.modified = now()
+        Appearance.objects.bulk_update(advancers, [
+            'draw',
+            'modified',
+        ])
         return
 
     @fsm_log_by
@@ -5049,6 +5082,14 @@ class Score(TimeStampedModel):
     def __str__(self):
         return str(self.id)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the stored points so the scoreboard can apply the delta
+        if 'points' in field_names:
+            instance._loaded_points = values[field_names.index('points')]
+        return instance
+
 
     # Score Permissions
     @staticmethod
@@ -5061,7 +5102,7 @@ class Score(TimeStampedModel):
     @authenticated_users
     def has_object_read_permission(self, request):
         # Assigned owners can always see
-        if request.user in self.song.appearance.round.owners.all():
+        if get_permissions(request).owns(self, 'song__appearance__round'):
             return True
         return False
 
@@ -5069,19 +5110,88 @@ class Score(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         if self.song.appearance.round.status == self.song.appearance.round.STATUS.published:
             return False
-        return request.user in self.song.appearance.round.owners.all()
+        return get_permissions(request).owns(self, 'song__appearance__round')
+
+
+class Scoreboard(models.Model):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+
+    category = models.IntegerField(
+        choices=Panelist.CATEGORY,
+    )
+
+    points = models.IntegerField(
+        help_text="""
+            The running total of official points.""",
+        default=0,
+    )
+
+    count = models.IntegerField(
+        help_text="""
+            The number of official scores in the total.""",
+        default=0,
+    )
+
+    # Denorm
+    session_id = models.UUIDField(
+        null=True,
+        blank=True,
+    )
+
+    group_id = models.UUIDField(
+        null=True,
+        blank=True,
+    )
+
+    # FKs
+    round = models.ForeignKey(
+        'Round',
+        related_name='scoreboards',
+        on_delete=models.CASCADE,
+    )
+
+    appearance = models.ForeignKey(
+        'Appearance',
+        related_name='scoreboards',
+        on_delete=models.CASCADE,
+    )
+
+    # Internals
+    objects = ScoreboardManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                name='unique_scoreboard',
+                fields=[
+                    'appearance',
+                    'category',
+                ]
+            )
+        ]
+        indexes = [
+            models.Index(
+                name='scoreboard_session_group',
+                fields=[
+                    'session_id',
+                    'group_id',
+                ]
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.id)
 
 
 class Song(TimeStampedModel):
@@ -5189,89 +5299,95 @@ class Song(TimeStampedModel):
         return str(self.id)
 
     # Methods
+    def get_official_scores(self):
+        Panelist = apps.get_model('adjudication.panelist')
+        return list(self.scores.filter(
+            panelist__kind=Panelist.KIND.official,
+        ).values_list(
+            'panelist__category',
+            'points',
+        ))
+
     def get_asterisks(self):
         """
         Check to see if the song produces a category variance (asterisk)
 
         Returns a list of categories that produced an asterisk.
         """
+        return self.calculate_asterisks(self.get_official_scores())
+
+    def get_dixons(self):
+        """
+        Check to see if the song produces a spread error (Dixon's Q)
+
+        Returns a list of categories that produced a Dixon's Q.
+        """
+        return self.calculate_dixons(self.get_official_scores())
+
+    @staticmethod
+    def calculate_asterisks(scores):
+        """
+        Asterisks from a list of (category, points) official scores.
+        """
         # Set Flag
         asterisks = []
         # Get Averages by category
-        categories = self.scores.filter(
-            panelist__kind=10,
-        ).values(
-            'panelist__category',
-        ).annotate(
-            avg=Avg('points'),
-        )
-        for category in categories:
-            category_scores = self.scores.filter(
-                panelist__category=category['panelist__category'],
-                panelist__kind=10,
-            )
-            for score in category_scores:
-                is_asterisk = abs(score.points - category['avg']) > 5
+        categories = {}
+        for category, points in scores:
+            if points is not None:
+                categories.setdefault(category, []).append(points)
+        for category, points in categories.items():
+            avg = sum(points) / len(points)
+            for point in points:
+                is_asterisk = abs(point - avg) > 5
                 if is_asterisk:
-                    asterisks.append(category['panelist__category'])
-                    continue
+                    asterisks.append(category)
         asterisks = list(set(asterisks))
         return asterisks
 
-    def get_dixons(self):
+    @staticmethod
+    def calculate_dixons(scores):
         """
-        Check to see if the song produces a spread error (Dixon's Q)
-
-        Returns a list of categories that produced a Dixon's Q.
+        Dixon's Q from a list of (category, points) official scores.
         """
         # Set flag
         output = []
         # Confidence thresholds
         confidence = {
-            '3': 0.941,
-            '6': .56,
-            '9': .376,
-            '12': .437,
-            '15': .338,
+            3: 0.941,
+            6: .56,
+            9: .376,
+            12: .437,
+            15: .338,
         }
-        # Only use official scores.
-        scores = self.scores.filter(
-            panelist__kind=10,
-        )
-        # Get the totals
-        aggregates = scores.aggregate(
-            cnt=Count('id'),
-            max=Max('points'),
-            min=Min('points'),
-            spread=Max('points') - Min('points'),
+        # Order the scores
+        ascending = sorted(
+            [x for x in scores if x[1] is not None],
+            key=lambda x: x[1],
         )
+        descending = ascending[::-1]
         # Check for validity.
-        if aggregates['cnt'] < 3:
-            return RuntimeError('Panel too small error')
+        if len(ascending) < 3:
+            return output
+        spread = ascending[-1][1] - ascending[0][1]
         # Bypass to avoid division by zero
-        if not aggregates['spread']:
+        if not spread:
             return output
-        # Order the scores
-        ascending = scores.order_by('points')
-        descending = scores.order_by('-points')
-        # Separate check for single-panel
-        if aggregates['cnt'] == '3':
-            if abs(ascending[0].points - ascending[1].points) >= 10:
-                output.append(ascending[0].panelist.category)
-            if abs(descending[0].points - descending[1].points) >= 10:
-                output.append(descending[0].panelist.category)
+
+        # No threshold for partial panels, e.g. while scores are entered
+        critical = confidence.get(len(ascending))
+        if critical is None:
             return output
 
-        # Otherwise, run the checks, both ascending and descending
-        critical = confidence[str(aggregates['cnt'])]
-        ascending_distance = abs(ascending[0].points - ascending[1].points)
-        ascending_q = ascending_distance / aggregates['spread']
+        # Run the checks, both ascending and descending
+        ascending_distance = abs(ascending[0][1] - ascending[1][1])
+        ascending_q = ascending_distance / spread
         if ascending_q > critical and ascending_distance > 4:
-            output.append(ascending[0].panelist.category)
-        descending_distance = abs(descending[0].points - descending[1].points)
-        descending_q = descending_distance / aggregates['spread']
+            output.append(ascending[0][0])
+        descending_distance = abs(descending[0][1] - descending[1][1])
+        descending_q = descending_distance / spread
         if descending_q > critical and descending_distance > 4:
-            output.append(descending[0].panelist.category)
+            output.append(descending[0][0])
         return output
 
 
@@ -5287,18 +5403,13 @@ class Song(TimeStampedModel):
     def has_object_read_permission(self, request):
         if self.appearance.round.status == self.appearance.round.STATUS.published:
             return True
-        return request.user in self.appearance.round.owners.all()
+        return get_permissions(request).owns(self, 'appearance__round')
 
     @staticmethod
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'CA',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'CA')
 
 
     @allow_staff_or_superuser
@@ -5306,5 +5417,5 @@ class Song(TimeStampedModel):
     def has_object_write_permission(self, request):
         if self.appearance.round.status == self.appearance.round.STATUS.published:
             return False
-        return request.user in self.appearance.round.owners.all()
+        return get_permissions(request).owns(self, 'appearance__round')
 
@@ -0,0 +1,63 @@
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+
+
+def get_prefetch_plan(serializer_class, parent=None):
+    """
+    Derive select_related and Prefetch lookups from a serializer.
+
+    To-one relations are joined unless an included serializer can type
+    them from the id alone.  To-many relations are prefetched with only
+    the columns needed to render their ids; included resources are
+    prefetched in full with their own plan.
+    """
+    model = serializer_class.Meta.model
+    included = getattr(
+        getattr(serializer_class, 'JSONAPIMeta', None),
+        'included_resources',
+        [],
+    )
+    included_serializers = getattr(serializer_class, 'included_serializers', {})
+    selects = []
+    prefetches = []
+    for name in serializer_class.Meta.fields:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not field.is_relation or field == parent:
+            continue
+        if field.many_to_one or field.one_to_one:
+            if name not in included_serializers:
+                selects.append(name)
+            continue
+        # The back reference is filled in by the prefetch itself
+        back = field.field if field.one_to_many else None
+        if name in included:
+            child = included_serializers[name]
+            if isinstance(child, str):
+                child = import_string(child)
+            child_selects, child_prefetches = get_prefetch_plan(child, parent=back)
+            queryset = field.related_model.objects.select_related(
+                *child_selects
+            ).prefetch_related(
+                *child_prefetches
+            )
+        else:
+            columns = ['id']
+            if back:
+                columns.append(back.name)
+            queryset = field.related_model.objects.only(*columns)
+        prefetches.append(Prefetch(name, queryset=queryset))
+    return selects, prefetches
+
+
+def prefetch_queryset(queryset, serializer_class):
+    selects, prefetches = get_prefetch_plan(serializer_class)
+    return queryset.select_related(
+        *selects
+    ).prefetch_related(
+        *prefetches
+    )
@@ -0,0 +1,93 @@
+# Standard Library
+import hashlib
+import logging
+
+# Django
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models import Max
+
+# Local
+from .tasks import render_report_from_instance
+
+log = logging.getLogger(__name__)
+
+# How long a render may run before another request can retry it.
+RENDER_TIMEOUT = 60 * 10
+# Superseded renders are deleted as they are replaced; this bounds the rest.
+REPORT_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def get_report_key(instance, kind):
+    """
+    Content key for a rendered report.
+
+    The key is a hash over the last-modified stamp and row count of
+    everything in the session the report draws from, so it changes as soon
+    as any score, song, appearance, panelist or outcome changes, or any of
+    the groups, charts, awards or persons they name.
+    """
+    Appearance = apps.get_model('adjudication.appearance')
+    Outcome = apps.get_model('adjudication.outcome')
+    Panelist = apps.get_model('adjudication.panelist')
+    Round = apps.get_model('adjudication.round')
+    Score = apps.get_model('adjudication.score')
+    Song = apps.get_model('adjudication.song')
+    Award = apps.get_model('bhs.award')
+    Chart = apps.get_model('bhs.chart')
+    Group = apps.get_model('bhs.group')
+    Person = apps.get_model('bhs.person')
+    if isinstance(instance, Round):
+        session_id = instance.session_id
+    else:
+        session_id = instance.round.session_id
+    sources = [
+        (Round, 'session_id'),
+        (Appearance, 'round__session_id'),
+        (Song, 'appearance__round__session_id'),
+        (Score, 'song__appearance__round__session_id'),
+        (Panelist, 'round__session_id'),
+        (Outcome, 'round__session_id'),
+    ]
+    # Rows from bhs that the reports render by name
+    references = [
+        (Group, 'group_id', Appearance, 'round__session_id'),
+        (Chart, 'chart_id', Song, 'appearance__round__session_id'),
+        (Award, 'award_id', Outcome, 'round__session_id'),
+        (Person, 'person_id', Panelist, 'round__session_id'),
+    ]
+    parts = [kind, str(instance.pk)]
+    querysets = [
+        model.objects.filter(**{lookup: session_id}) for model, lookup in sources
+    ] + [
+        model.objects.filter(
+            id__in=source.objects.filter(
+                **{lookup: session_id}
+            ).values(field),
+        ) for model, field, source, lookup in references
+    ]
+    for queryset in querysets:
+        stamp = queryset.aggregate(
+            max=Max('modified'),
+            cnt=Count('id'),
+        )
+        parts.append("{0}|{1}".format(stamp['max'], stamp['cnt']))
+    digest = hashlib.sha1(":".join(parts).encode()).hexdigest()
+    return "report:{0}:{1}:{2}".format(kind, instance.pk, digest)
+
+
+def get_report(instance, kind):
+    """
+    Return the rendered report if it is cached for the current inputs.
+
+    Otherwise queue a render and return None.  Concurrent requests for the
+    same key share a single job.
+    """
+    key = get_report_key(instance, kind)
+    content = cache.get(key)
+    if content is not None:
+        return content
+    if cache.add("{0}:pending".format(key), True, RENDER_TIMEOUT):
+        render_report_from_instance.delay(instance, kind, key, REPORT_TIMEOUT)
+    return None
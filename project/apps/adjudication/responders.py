@@ -2,6 +2,9 @@
 # Third-Party
 from rest_framework.response import Response
 
+# Django
+from django.http import JsonResponse
+
 
 class PDFResponse(Response):
     def __init__(self, pdf, file_name, *args, **kwargs):
@@ -48,3 +51,19 @@ class DOCXResponse(Response):
             *args,
             **kwargs
         )
+
+
+class PendingResponse(JsonResponse):
+    def __init__(self, url, *args, **kwargs):
+        data = {
+            'status': 'Report is rendering; retry at url.',
+            'url': url,
+        }
+        super().__init__(
+            data,
+            status=202,
+            *args,
+            **kwargs
+        )
+        self['Location'] = url
+        self['Retry-After'] = 5
@@ -1,9 +1,11 @@
 
 # Third-Party
-from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework.validators import UniqueTogetherValidator
 from rest_framework_json_api import serializers
 
+# First-Party
+from apps.bhs.fields import PermissionsField
+
 # Local
 from .fields import TimezoneField
 
@@ -16,7 +18,7 @@ from .models import Song
 
 
 class AppearanceSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     included_serializers = {
         # 'songs': 'apps.adjudication.serializers.SongSerializer',
     }
@@ -68,7 +70,7 @@ class AppearanceSerializer(serializers.ModelSerializer):
 
 
 class OutcomeSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Outcome
@@ -103,7 +105,7 @@ class OutcomeSerializer(serializers.ModelSerializer):
 
 
 class PanelistSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     # included_serializers = {
     #     'scores': 'apps.adjudication.serializers.ScoreSerializer',
     # }
@@ -141,7 +143,7 @@ class PanelistSerializer(serializers.ModelSerializer):
 
 
 class RoundSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     included_serializers = {
         # 'appearances': 'apps.adjudication.serializers.AppearanceSerializer',
         # 'outcomes': 'apps.adjudication.serializers.OutcomeSerializer',
@@ -189,7 +191,7 @@ class RoundSerializer(serializers.ModelSerializer):
 
 
 class ScoreSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Score
@@ -205,8 +207,19 @@ class ScoreSerializer(serializers.ModelSerializer):
         ]
 
 
+class ScoreEntrySerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField()
+
+    class Meta:
+        model = Score
+        fields = [
+            'id',
+            'points',
+        ]
+
+
 class SongSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     included_serializers = {
         'scores': 'apps.adjudication.serializers.ScoreSerializer',
     }
@@ -1,20 +1,49 @@
+# Standard Library
+import threading
+
 import django_rq
 
 # Django
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 from django_fsm.signals import post_transition
 # Local
 from .models import Appearance
 from .models import Panelist
 from .models import Round
+from .models import Score
+from .models import Scoreboard
+from .models import Song
 
+from .events import publish_event
+from .events import publish_score
 from .tasks import save_reports_from_round
 from .tasks import save_psa_from_panelist
 from .tasks import save_csa_from_appearance
 
+# Songs and panelists whose scores are going with them in a cascade, and
+# the rounds to rebuild once those scores are gone.  Per thread, since a
+# worker serves requests on several.
+cascade = threading.local()
+
+
+def get_cascade():
+    if not hasattr(cascade, 'songs'):
+        cascade.songs = set()
+        cascade.panelists = set()
+        cascade.rounds = set()
+    return cascade
+
 
 @receiver(post_transition, sender=Appearance)
 def appearance_post_transition(sender, instance, name, source, target, **kwargs):
+    publish_event(instance.round_id, 'appearance', {
+        'id': instance.id,
+        'status': target,
+        'transition': name,
+    })
     if name == 'complete':
         save_csa_from_appearance.delay(instance)
         return
@@ -29,7 +58,92 @@ def panelist_post_transition(sender, instance, name, source, target, **kwargs):
 
 @receiver(post_transition, sender=Round)
 def round_post_transition(sender, instance, name, source, target, **kwargs):
+    publish_event(instance.id, 'round', {
+        'id': instance.id,
+        'status': target,
+        'transition': name,
+    })
     if name == 'finalize':
         save_reports_from_round.delay(instance)
         return
-    return
\ No newline at end of file
+    return
+
+
+@receiver(post_save, sender=Score)
+def score_post_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    # Loaded once for both the scoreboard and the event
+    song = Scoreboard.objects.get_song(instance)
+    Scoreboard.objects.update_from_score(
+        instance,
+        getattr(instance, '_loaded_points', None),
+        instance.points,
+        song=song,
+    )
+    instance._loaded_points = instance.points
+    if song:
+        publish_score(song['appearance__round_id'], instance)
+    return
+
+
+@receiver(post_delete, sender=Score)
+def score_post_delete(sender, instance, **kwargs):
+    current = get_cascade()
+    # Cascaded scores are settled by one rebuild per round instead
+    if instance.song_id in current.songs or instance.panelist_id in current.panelists:
+        return
+    Scoreboard.objects.update_from_score(
+        instance,
+        getattr(instance, '_loaded_points', instance.points),
+        None,
+    )
+    return
+
+
+@receiver(pre_delete, sender=Song)
+def song_pre_delete(sender, instance, **kwargs):
+    current = get_cascade()
+    current.songs.add(instance.id)
+    current.rounds.add(
+        Appearance.objects.filter(
+            id=instance.appearance_id,
+        ).values_list('round_id', flat=True).first()
+    )
+    return
+
+
+@receiver(pre_delete, sender=Panelist)
+def panelist_pre_delete(sender, instance, **kwargs):
+    current = get_cascade()
+    current.panelists.add(instance.id)
+    current.rounds.add(instance.round_id)
+    return
+
+
+@receiver(post_delete, sender=Song)
+@receiver(post_delete, sender=Panelist)
+def cascade_post_delete(sender, instance, **kwargs):
+    # Scores are deleted before their songs and panelists, so by now every
+    # cascaded score is gone
+    current = get_cascade()
+    current.songs.discard(instance.id)
+    current.panelists.discard(instance.id)
+    round_ids = [x for x in current.rounds if x]
+    current.rounds.clear()
+    for round in Round.objects.filter(id__in=round_ids):
+        Scoreboard.objects.rebuild(round)
+    return
+
+
+@receiver(post_save, sender=Panelist)
+def panelist_post_save(sender, instance, created, raw, **kwargs):
+    if raw or created:
+        return
+    loaded = getattr(instance, '_loaded_panel', None)
+    current = (instance.kind, instance.category)
+    instance._loaded_panel = current
+    # A new kind or category moves all of the panelist's scores
+    if loaded and loaded != current:
+        Scoreboard.objects.rebuild(instance.round)
+    return
@@ -0,0 +1,107 @@
+# Standard Library
+import logging
+
+# Django
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+# First-Party
+from apps.bhs.permissions import get_permissions
+
+log = logging.getLogger(__name__)
+
+# Published rounds are invalidated explicitly on reset; this only bounds
+# snapshots orphaned by other deletes.
+SNAPSHOT_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def get_snapshot_audience(request, round):
+    """
+    Who a published round is being rendered for.
+
+    Once a round is published every permissions block in its tree depends
+    only on whether the user is staff or one of the round's owners.
+    """
+    if request.user.is_staff or request.user.is_superuser:
+        return 'staff'
+    if get_permissions(request).owns(round):
+        return 'owner'
+    return 'user'
+
+
+def get_snapshot_key(round, request, resource, pk):
+    return "snapshot:{0}:{1}:{2}:{3}:{4}:{5}".format(
+        round.id,
+        round.modified.timestamp(),
+        resource,
+        pk,
+        get_snapshot_audience(request, round),
+        request.accepted_media_type,
+    )
+
+
+def delete_snapshots(round):
+    return cache.delete_pattern("snapshot:{0}:*".format(round.id))
+
+
+class SnapshotMixin(object):
+    """
+    Serve detail GETs inside a published round from a frozen snapshot.
+
+    The first read of a document after publishing stores the rendered bytes;
+    later reads return them without touching the scoring tables.
+    """
+    snapshot_lookup = 'id'
+
+    def get_snapshot_key(self, request, pk):
+        Round = apps.get_model('adjudication.round')
+        if request.query_params:
+            return None
+        try:
+            round = Round.objects.filter(
+                status=Round.STATUS.published,
+                **{self.snapshot_lookup: pk}
+            ).only(
+                'id',
+                'status',
+                'modified',
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            # Leave malformed ids to the normal 404
+            return None
+        if not round:
+            return None
+        return get_snapshot_key(round, request, self.resource_name, pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        key = self.get_snapshot_key(request, pk)
+        if not key:
+            return super().retrieve(request, *args, **kwargs)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            self.snapshot_key = key
+            return super().retrieve(request, *args, **kwargs)
+        content, content_type, etag = snapshot
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'snapshot_key', None)
+        if key and response.status_code == 200:
+            def store(rendered):
+                cache.set(
+                    key,
+                    (rendered.content, rendered['Content-Type'], rendered.get('ETag')),
+                    SNAPSHOT_TIMEOUT,
+                )
+            response.add_post_render_callback(store)
+        return response
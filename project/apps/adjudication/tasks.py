@@ -8,6 +8,7 @@ from django.core.mail import EmailMessage
 # Django
 from django.template.loader import render_to_string
 from django.apps import apps
+from django.core.cache import cache
 
 log = logging.getLogger(__name__)
 
@@ -143,3 +144,19 @@ def save_psa_from_panelist(panelist):
 @job('high')
 def save_reports_from_round(round):
     return round.save_reports()
+
+
+@job('high')
+def render_report_from_instance(instance, kind, key, timeout):
+    try:
+        content = getattr(instance, 'get_{0}'.format(kind))()
+        cache.set(key, content.read(), timeout=timeout)
+        # Drop the render this one replaces
+        latest = "{0}:latest".format(key.rpartition(':')[0])
+        previous = cache.get(latest)
+        if previous and previous != key:
+            cache.delete(previous)
+        cache.set(latest, key, timeout=timeout)
+    finally:
+        cache.delete("{0}:pending".format(key))
+    return key
@@ -1,4 +1,7 @@
 
+# Standard Library
+import json
+
 # Third-Party
 import pytest
 from rest_framework import status
@@ -6,6 +9,9 @@ from rest_framework import status
 # Django
 from django.urls import reverse
 
+# Local
+from .factories import ScoreFactory
+
 pytestmark = pytest.mark.django_db
 
 
@@ -73,3 +79,19 @@ def test_song_endpoint(admin_api_client, song, django_assert_max_num_queries):
         path = reverse('song-detail', args=(str(song.id),))
         response = admin_api_client.get(path)
         assert response.status_code == status.HTTP_200_OK
+
+
+def test_song_score_action(admin_api_client, song):
+    scores = ScoreFactory.create_batch(3, song=song)
+    path = reverse('song-score', args=(str(song.id),))
+    data = [{'id': str(x.id), 'points': 80} for x in scores]
+    response = admin_api_client.post(path, json.dumps(data), content_type='application/json')
+    assert response.status_code == status.HTTP_200_OK
+    for score in scores:
+        score.refresh_from_db()
+        assert score.points == 80
+    data[0]['points'] = 101
+    response = admin_api_client.post(path, json.dumps(data), content_type='application/json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    scores[0].refresh_from_db()
+    assert scores[0].points == 80
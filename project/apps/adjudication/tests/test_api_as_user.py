@@ -2,10 +2,22 @@
 # Third-Party
 import pytest
 from rest_framework import status
+from rest_framework.test import APIClient
 
 # Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+# First-Party
+from apps.adjudication.models import Round
+
+# Local
+from .factories import AppearanceFactory
+from .factories import RoundFactory
+from .factories import ScoreFactory
+from .factories import SongFactory
+
 pytestmark = pytest.mark.django_db
 
 
@@ -67,3 +79,57 @@ def test_song_endpoint(user_api_client, song):
     response = user_api_client.get(path)
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
+
+def test_round_events_need_owner(user_api_client, round):
+    path = reverse('round-events', args=(str(round.id),))
+    response = user_api_client.get(path)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def count_queries(client, path):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(path)
+        assert response.status_code == status.HTTP_200_OK
+    return len(context)
+
+
+def test_round_detail_query_count(user_api_client, round):
+    AppearanceFactory(round=round)
+    path = reverse('round-detail', args=(str(round.id),))
+    baseline = count_queries(user_api_client, path)
+    AppearanceFactory.create_batch(5, round=round)
+    assert count_queries(user_api_client, path) == baseline
+
+
+def test_appearance_list_query_count(user_api_client, round):
+    SongFactory(appearance=AppearanceFactory(round=round))
+    path = reverse('appearance-list')
+    baseline = count_queries(user_api_client, path)
+    for num in range(2, 6):
+        SongFactory(appearance=AppearanceFactory(round=round, num=num))
+    assert count_queries(user_api_client, path) == baseline
+
+
+def test_song_detail_query_count(user, song):
+    # Unpublished songs are only readable by the round's owners
+    song.appearance.round.owners.add(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    ScoreFactory(song=song)
+    path = reverse('song-detail', args=(str(song.id),))
+    baseline = count_queries(client, path)
+    ScoreFactory.create_batch(5, song=song)
+    assert count_queries(client, path) == baseline
+
+
+def test_published_round_snapshot(user_api_client, django_assert_max_num_queries):
+    round = RoundFactory(status=Round.STATUS.published)
+    AppearanceFactory.create_batch(3, round=round)
+    path = reverse('round-detail', args=(str(round.id),))
+    response = user_api_client.get(path)
+    assert response.status_code == status.HTTP_200_OK
+    # Only the published lookup and the ownership check remain
+    with django_assert_max_num_queries(2):
+        snapshot = user_api_client.get(path)
+    assert snapshot.status_code == status.HTTP_200_OK
+    assert snapshot.content == response.content
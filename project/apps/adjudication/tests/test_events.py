@@ -0,0 +1,25 @@
+# Standard Library
+import json
+import uuid
+
+# Third-Party
+import pytest
+
+# First-Party
+from apps.adjudication.events import publish_event
+from apps.adjudication.events import stream_events
+
+
+# Events are published on commit
+@pytest.mark.django_db(transaction=True)
+def test_round_event_stream():
+    round_id = uuid.uuid4()
+    stream = stream_events(round_id, timeout=5)
+    assert next(stream).startswith('retry:')
+    publish_event(uuid.uuid4(), 'score', {'points': 70})
+    publish_event(round_id, 'score', {'id': round_id, 'points': 80})
+    event = next(stream)
+    kind, data = event.strip().split('\n')
+    assert kind == 'event: score'
+    assert json.loads(data.partition(': ')[2]) == {'id': str(round_id), 'points': 80}
+    stream.close()
@@ -0,0 +1,90 @@
+# Third-Party
+import pytest
+
+# Django
+from django.db.models import Count
+from django.db.models import Sum
+
+# First-Party
+from apps.adjudication.models import Panelist
+from apps.adjudication.models import Score
+from apps.adjudication.models import Scoreboard
+from apps.adjudication.tests.factories import PanelistFactory
+from apps.adjudication.tests.factories import ScoreFactory
+from apps.adjudication.tests.factories import SongFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def get_totals():
+    fresh = Score.objects.filter(
+        panelist__kind=Panelist.KIND.official,
+        points__isnull=False,
+    ).values(
+        'song__appearance_id',
+        'panelist__category',
+    ).annotate(
+        points_sum=Sum('points'),
+        points_count=Count('points'),
+    ).order_by()
+    return (
+        sorted(
+            (x['song__appearance_id'], x['panelist__category'], x['points_sum'], x['points_count'])
+            for x in fresh
+        ),
+        sorted(
+            (x.appearance_id, x.category, x.points, x.count)
+            for x in Scoreboard.objects.filter(count__gt=0)
+        ),
+    )
+
+
+def test_scoreboard_follows_scores():
+    song = SongFactory()
+    panelist = PanelistFactory(round=song.appearance.round)
+    ScoreFactory(song=song, panelist=panelist, points=70)
+    score = ScoreFactory(song=song, panelist=panelist, points=80)
+    ScoreFactory(song=song, panelist=PanelistFactory(kind=Panelist.KIND.practice), points=60)
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh == [(song.appearance_id, panelist.category, 150, 2)]
+
+    score = Score.objects.get(id=score.id)
+    score.points = 90
+    score.save()
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh
+
+    Score.objects.get(id=score.id).delete()
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh == [(song.appearance_id, panelist.category, 70, 1)]
+
+
+def test_scoreboard_follows_cascades_and_panel_changes():
+    song = SongFactory()
+    panelist = PanelistFactory(round=song.appearance.round)
+    ScoreFactory(song=song, panelist=panelist, points=70)
+    ScoreFactory(song=SongFactory(appearance=song.appearance, num=2), panelist=panelist, points=75)
+
+    panelist = Panelist.objects.get(id=panelist.id)
+    panelist.category = Panelist.CATEGORY.singing
+    panelist.save()
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh == [(song.appearance_id, Panelist.CATEGORY.singing, 145, 2)]
+
+    song.delete()
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh == [(song.appearance_id, Panelist.CATEGORY.singing, 75, 1)]
+
+
+def test_scoreboard_rebuilds_once_on_panelist_cascade(django_assert_max_num_queries):
+    song = SongFactory()
+    panelist = PanelistFactory(round=song.appearance.round)
+    other = PanelistFactory(round=song.appearance.round)
+    for num in range(2, 12):
+        ScoreFactory(song=SongFactory(appearance=song.appearance, num=num), panelist=panelist, points=70)
+    ScoreFactory(song=song, panelist=other, points=80)
+    # Per-score scoreboard queries would blow well past this
+    with django_assert_max_num_queries(20):
+        Panelist.objects.get(id=panelist.id).delete()
+    fresh, scoreboard = get_totals()
+    assert scoreboard == fresh == [(song.appearance_id, other.category, 80, 1)]
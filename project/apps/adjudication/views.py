@@ -11,6 +11,9 @@ from dry_rest_permissions.generics import DRYPermissions
 from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -18,15 +21,22 @@ from rest_framework.response import Response
 # Django
 from django.core.files.base import ContentFile
 from django.db.models import Sum, Q, Avg
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils.text import slugify
 
+# First-Party
+from apps.bhs.mixins import ConditionalMixin
+from apps.bhs.permissions import get_permissions
+
 # Local
 # from .filterbackends import AppearanceFilterBackend
 # from .filterbackends import OutcomeFilterBackend
 # from .filterbackends import ScoreFilterBackend
 # from .filterbackends import SongFilterBackend
 
+from .events import stream_events
 from .filtersets import RoundFilterset
 from .filtersets import ScoreFilterset
 
@@ -43,11 +53,16 @@ from .responders import PDFResponse
 from .responders import XLSXResponse
 from .renderers import DOCXRenderer
 from .responders import DOCXResponse
+from .responders import PendingResponse
+from .prefetchers import prefetch_queryset
+from .reports import get_report
+from .snapshots import SnapshotMixin
 
 from .serializers import AppearanceSerializer
 from .serializers import OutcomeSerializer
 from .serializers import PanelistSerializer
 from .serializers import RoundSerializer
+from .serializers import ScoreEntrySerializer
 from .serializers import ScoreSerializer
 from .serializers import SongSerializer
 
@@ -72,15 +87,30 @@ class IgnoreClientContentNegotiation(BaseContentNegotiation):
         return (renderers[0], renderers[0].media_type)
 
 
-class AppearanceViewSet(viewsets.ModelViewSet):
-    queryset = Appearance.objects.select_related(
-        'round',
-        # 'group',
-        # 'entry',
-    ).prefetch_related(
-        'owners',
-        'songs',
-        # 'statelogs',
+def update_scores(request, round, scores):
+    """
+    Validate a list of score entries and write them in one pass.
+    """
+    serializer = ScoreEntrySerializer(data=request.data, many=True)
+    serializer.is_valid(raise_exception=True)
+    points = {x['id']: x['points'] for x in serializer.validated_data}
+    scores = {x.id: x for x in scores}
+    unknown = sorted(str(x) for x in set(points) - set(scores))
+    if unknown:
+        raise ValidationError({
+            'id': ["Score {0} is not part of this request.".format(x) for x in unknown],
+        })
+    return Score.objects.update_points(
+        round,
+        [scores[x] for x in points],
+        points,
+    )
+
+
+class AppearanceViewSet(SnapshotMixin, ConditionalMixin, viewsets.ModelViewSet):
+    queryset = prefetch_queryset(
+        Appearance.objects.all(),
+        AppearanceSerializer,
     ).order_by('id')
     serializer_class = AppearanceSerializer
     filterset_class = None
@@ -92,6 +122,7 @@ class AppearanceViewSet(viewsets.ModelViewSet):
         DRYPermissions,
     ]
     resource_name = "appearance"
+    snapshot_lookup = 'appearances__id'
 
     @action(methods=['get'], detail=True)
     def mock(self, request, pk=None, **kwargs):
@@ -104,6 +135,20 @@ class AppearanceViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(object)
         return Response(serializer.data)
 
+    @action(methods=['post'], detail=True, parser_classes=[JSONParser])
+    def score(self, request, pk=None, **kwargs):
+        """
+        Sets the points for any of the Appearance's scores at once.
+        """
+        object = self.get_object()
+        update_scores(
+            request,
+            object.round,
+            Score.objects.filter(song__appearance=object),
+        )
+        serializer = self.get_serializer(object)
+        return Response(serializer.data)
+
     @action(methods=['post'], detail=True)
     def start(self, request, pk=None, **kwargs):
         object = self.get_object()
@@ -246,7 +291,9 @@ class AppearanceViewSet(viewsets.ModelViewSet):
         if appearance.csa_report:
             pdf = appearance.csa_report.file
         else:
-            pdf = appearance.get_csa()
+            pdf = get_report(appearance, 'csa')
+            if pdf is None:
+                return PendingResponse(request.build_absolute_uri())
         file_name = '{0} CSA.pdf'.format(appearance)
         return PDFResponse(
             pdf,
@@ -255,7 +302,7 @@ class AppearanceViewSet(viewsets.ModelViewSet):
         )
 
 
-class OutcomeViewSet(viewsets.ModelViewSet):
+class OutcomeViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Outcome.objects.select_related(
         'round',
         # 'award',
@@ -273,7 +320,7 @@ class OutcomeViewSet(viewsets.ModelViewSet):
     resource_name = "outcome"
 
 
-class PanelistViewSet(viewsets.ModelViewSet):
+class PanelistViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Panelist.objects.select_related(
         'round',
         # 'user',
@@ -303,7 +350,9 @@ class PanelistViewSet(viewsets.ModelViewSet):
         if panelist.psa_report:
             pdf = panelist.psa_report.file
         else:
-            pdf = panelist.get_psa()
+            pdf = get_report(panelist, 'psa')
+            if pdf is None:
+                return PendingResponse(request.build_absolute_uri())
         file_name = '{0} PSA.pdf'.format(panelist)
         return PDFResponse(
             pdf,
@@ -312,16 +361,10 @@ class PanelistViewSet(viewsets.ModelViewSet):
         )
 
 
-class RoundViewSet(viewsets.ModelViewSet):
-    queryset = Round.objects.select_related(
-        # 'session',
-    ).prefetch_related(
-        'owners',
-        'appearances',
-        # 'appearances__owners',
-        # 'appearances__songs',
-        # 'panelists__scores',
-        # 'outcomes__award',
+class RoundViewSet(SnapshotMixin, ConditionalMixin, viewsets.ModelViewSet):
+    queryset = prefetch_queryset(
+        Round.objects.all(),
+        RoundSerializer,
     ).order_by('id')
     serializer_class = RoundSerializer
     filterset_class = RoundFilterset
@@ -341,6 +384,33 @@ class RoundViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(object)
         return Response(serializer.data)
 
+    @action(
+        methods=['get'],
+        detail=True,
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def events(self, request, pk=None):
+        """
+        Streams score, appearance and round changes as server-sent events.
+        """
+        # Skip the serializer prefetches; only permissions are needed
+        round = get_object_or_404(Round.objects.only('id'), pk=pk)
+        self.check_object_permissions(request, round)
+        # Live scores are only visible to the round's owners
+        if not any([
+            request.user.is_staff,
+            request.user.is_superuser,
+            get_permissions(request).owns(round),
+        ]):
+            raise PermissionDenied
+        response = StreamingHttpResponse(
+            stream_events(round.id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
     @action(methods=['post'], detail=True)
     def reset(self, request, pk=None, **kwargs):
         object = self.get_object()
@@ -443,7 +513,9 @@ class RoundViewSet(viewsets.ModelViewSet):
         if round.oss_report:
             pdf = round.oss_report.file
         else:
-            pdf = round.get_oss()
+            pdf = get_report(round, 'oss')
+            if pdf is None:
+                return PendingResponse(request.build_absolute_uri())
         file_name = '{0} OSS.pdf'.format(round)
         return PDFResponse(
             pdf,
@@ -538,7 +610,9 @@ class RoundViewSet(viewsets.ModelViewSet):
         if round.sa_report:
             pdf = round.sa_report.file
         else:
-            pdf = round.get_sa()
+            pdf = get_report(round, 'sa')
+            if pdf is None:
+                return PendingResponse(request.build_absolute_uri())
         file_name = '{0} SA'.format(
             round.nomen,
         )
@@ -572,9 +646,9 @@ class RoundViewSet(viewsets.ModelViewSet):
         )
 
 
-class ScoreViewSet(viewsets.ModelViewSet):
+class ScoreViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Score.objects.select_related(
-        'song',
+        'song__appearance',
         'panelist',
     ).prefetch_related(
     ).order_by('id')
@@ -588,14 +662,19 @@ class ScoreViewSet(viewsets.ModelViewSet):
         DRYPermissions,
     ]
     resource_name = "score"
+    conditional_parents = [
+        'song',
+        'song__appearance__round',
+        'panelist',
+    ]
 
 
-class SongViewSet(viewsets.ModelViewSet):
-    queryset = Song.objects.select_related(
-        'appearance',
-    ).prefetch_related(
-        'scores',
-        'scores__panelist',
+class SongViewSet(SnapshotMixin, ConditionalMixin, viewsets.ModelViewSet):
+    queryset = prefetch_queryset(
+        Song.objects.select_related(
+            'appearance__round',
+        ),
+        SongSerializer,
     ).order_by('id')
     serializer_class = SongSerializer
     filterset_class = None
@@ -607,3 +686,22 @@ class SongViewSet(viewsets.ModelViewSet):
         DRYPermissions,
     ]
     resource_name = "song"
+    conditional_parents = [
+        'appearance',
+        'appearance__round',
+    ]
+    snapshot_lookup = 'appearances__songs__id'
+
+    @action(methods=['post'], detail=True, parser_classes=[JSONParser])
+    def score(self, request, pk=None, **kwargs):
+        """
+        Sets the points for any of the Song's scores at once.
+        """
+        object = self.get_object()
+        update_scores(
+            request,
+            object.appearance.round,
+            object.scores.all(),
+        )
+        serializer = self.get_serializer(object)
+        return Response(serializer.data)
@@ -30,4 +30,18 @@ class BhsConfig(AppConfig):
         Convention = self.get_model('convention')
         algoliasearch.register(Convention, ConventionIndex)
 
+        # Saves only mark rows dirty; a queued job pushes them in batches
+        from django.conf import settings
+        if settings.ALGOLIA.get('DEFERRED_INDEXING'):
+            from django.db.models.signals import m2m_changed
+            from django.db.models.signals import post_delete
+            from django.db.models.signals import post_save
+            from .search import m2m_receiver
+            from .search import save_receiver
+            for model in [Award, Chart, Group, Person, Convention]:
+                post_save.connect(save_receiver, sender=model)
+                post_delete.connect(save_receiver, sender=model)
+            m2m_changed.connect(m2m_receiver, sender=Group.owners.through)
+            m2m_changed.connect(m2m_receiver, sender=Group.charts.through)
+
         return
@@ -11,6 +11,7 @@ from django.utils.deconstruct import deconstructible
 from rest_framework_json_api import serializers
 from django.contrib.postgres.fields import ArrayField
 from django.forms import MultipleChoiceField
+from dry_rest_permissions.generics import DRYPermissionsField
 
 
 @deconstructible
@@ -157,3 +158,38 @@ class TimezoneField(serializers.Field):
             return pytz.timezone(str(data))
         except pytz.exceptions.UnknownTimeZoneError:
             raise ValidationError('Unknown timezone')
+
+
+class PermissionsField(DRYPermissionsField):
+    """
+    DRYPermissionsField that evaluates global permissions once per request.
+
+    The child serializer, and so this field, is shared by every row of a
+    list, so the global map is computed for the first row and reused.
+    Object permissions still run per row against the request's cached
+    roles and owned ids.
+    """
+
+    def get_global_permissions(self, request):
+        cached = getattr(self, '_global_permissions', None)
+        if cached and cached[0] is request:
+            return cached[1]
+        results = {}
+        if not self.object_only:
+            model = self.parent.Meta.model
+            for action, method_names in self.action_method_map.items():
+                if method_names.get('global', None) is not None:
+                    results[action] = getattr(model, method_names['global'])(request)
+        self._global_permissions = (request, results)
+        return results
+
+    def to_representation(self, value):
+        request = self.context['request']
+        global_permissions = self.get_global_permissions(request)
+        results = {}
+        for action, method_names in self.action_method_map.items():
+            if action in global_permissions:
+                results[action] = global_permissions[action]
+            if not self.global_only and results.get(action, True) and method_names.get('object', None) is not None:
+                results[action] = getattr(value, method_names['object'])(request)
+        return results
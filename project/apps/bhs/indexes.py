@@ -124,6 +124,11 @@ class GroupIndex(AlgoliaIndex):
         ]
     }
     should_index = 'is_searchable'
+    # Loaded with each batch so records build without per-row queries
+    prefetch_related = [
+        'owners',
+        'charts',
+    ]
 
 
 class PersonIndex(AlgoliaIndex):
@@ -10,14 +10,17 @@ from django.contrib.auth import get_user_model
 from django.apps import apps
 from django.conf import settings
 
-from apps.bhs.tasks import update_person_from_membercenter
-from apps.bhs.tasks import update_group_from_membercenter
+from apps.bhs.tasks import update_persons_from_membercenter
+from apps.bhs.tasks import update_groups_from_membercenter
 from apps.bhs.tasks import update_group_owners_from_membercenter
+from apps.bhs.membercenter import fetch_pages
+from apps.bhs.membercenter import fetch_records
 
 # First-Party
 User = get_user_model()
 Person = apps.get_model('bhs.person')
 Group = apps.get_model('bhs.group')
+Cursor = apps.get_model('bhs.cursor')
 
 log = logging.getLogger('updater')
 
@@ -53,7 +56,24 @@ class Command(BaseCommand):
             help='Number of hours to update.',
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            dest='workers',
+            default=4,
+            help='Number of pages to fetch concurrently.',
+        )
+
+        parser.add_argument(
+            '--since-last',
+            action='store_true',
+            dest='since_last',
+            help='Resume from the last committed sync cursor.',
+        )
+
     def handle(self, *args, **options):
+        self.workers = options['workers']
+        self.since_last = options['since_last']
         # Set Cursor
         if options['days']:
             cursor = timezone.now() - datetime.timedelta(days=options['days'], hours=1)
@@ -66,89 +86,21 @@ class Command(BaseCommand):
 
         # Sync Persons
         self.stdout.write("Fetching Persons from Member Center...")
-        endpoint, _, token = settings.MEMBERCENTER_URL.partition('@')
-        url = "{0}/bhs/person".format(endpoint)
-        headers = {
-            'Authorization': 'Token {0}'.format(token)
-        }
-        page = 1
         params = {
             'filter[status]': Person.STATUS.active,
-            'filter[modified__gt]': cursor,
-            'page[number]': page,
+            'filter[modified__gt]': self.get_cursor('person', cursor),
         }
-        response = requests.get(
-            url,
-            headers=headers,
-            params=params,
-        )
-        response.raise_for_status()
-        response_json = response.json()
-        t = response_json['meta']['pagination']['count']
-        if t:
-            i = 0
-            pages = response_json['meta']['pagination']['pages']
-            while page <= pages:
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    params=params,
-                )
-                response.raise_for_status()
-                response_json = response.json()
-                items = response_json['data']
-                for item in items:
-                    i += 1
-                    self.stdout.flush()
-                    self.stdout.write("Updating {0} of {1} Persons...".format(i, t), ending='\r')
-                    update_person_from_membercenter.delay(item)
-                page += 1
-                params['page[number]'] = page
-            self.stdout.write("")
+        t = self.sync('/bhs/person', params, update_persons_from_membercenter, 'Persons')
         self.stdout.write("Updated {0} Persons.".format(t))
 
         # Sync Groups
         self.stdout.write("Fetching Groups from Member Center...")
-        endpoint, _, token = settings.MEMBERCENTER_URL.partition('@')
-        url = "{0}/bhs/group".format(endpoint)
-        headers = {
-            'Authorization': 'Token {0}'.format(token)
-        }
-        page = 1
         params = {
             'filter[status]': Group.STATUS.active,
             'filter[kind__gt]': 30,
-            'filter[modified__gt]': cursor,
-            'page[number]': page,
+            'filter[modified__gt]': self.get_cursor('group', cursor),
         }
-        response = requests.get(
-            url,
-            headers=headers,
-            params=params,
-        )
-        response.raise_for_status()
-        response_json = response.json()
-        t = response_json['meta']['pagination']['count']
-        if t:
-            i = 0
-            pages = response_json['meta']['pagination']['pages']
-            while page <= pages:
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    params=params,
-                )
-                response.raise_for_status()
-                response_json = response.json()
-                items = response_json['data']
-                for item in items:
-                    i += 1
-                    self.stdout.flush()
-                    self.stdout.write("Updating {0} of {1} Groups...".format(i, t), ending='\r')
-                    update_group_from_membercenter.delay(item)
-                page += 1
-                params['page[number]'] = page
-            self.stdout.write("")
+        t = self.sync('/bhs/group', params, update_groups_from_membercenter, 'Groups')
         self.stdout.write("Updated {0} Groups.".format(t))
 
         # Sync Roles
@@ -192,3 +144,42 @@ class Command(BaseCommand):
         # self.stdout.write("Updated {0} Officers.".format(t))
 
         self.stdout.write("Complete.")
+
+    def get_cursor(self, resource, cursor):
+        if not self.since_last:
+            return cursor
+        return Cursor.objects.get_cursor(resource)
+
+    def sync(self, path, params, task, name):
+        # Pages arrive concurrently; each is queued as soon as it lands
+        resource = path.rpartition('/')[2] if self.since_last else None
+        if resource:
+            # Oldest first so the cursor only ever trails committed pages
+            params = dict(params, sort='modified')
+        t = 0
+        i = 0
+        job = None
+        if resource:
+            # Retry rows an earlier run had to skip
+            skipped = Cursor.objects.take_skipped(resource)
+            if skipped:
+                items = list(fetch_records(path, skipped, workers=self.workers))
+                if items:
+                    job = task.delay(items, resource)
+        for response_json in fetch_pages(path, params, workers=self.workers):
+            t = response_json['meta']['pagination']['count']
+            items = response_json['data']
+            if not items:
+                continue
+            i += len(items)
+            self.stdout.flush()
+            self.stdout.write("Updating {0} of {1} {2}...".format(i, t, name), ending='\r')
+            # One job per page
+            if resource:
+                # Chain pages so the cursor advances in order
+                job = task.delay(items, resource, depends_on=job)
+            else:
+                task.delay(items)
+        if i:
+            self.stdout.write("")
+        return t
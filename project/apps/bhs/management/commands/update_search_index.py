@@ -0,0 +1,30 @@
+# Django
+from django.core.management.base import BaseCommand
+
+# First-Party
+from apps.bhs.tasks import update_search_index
+
+
+class Command(BaseCommand):
+    help = "Command to push queued search index changes to Algolia."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--now',
+            action='store_true',
+            dest='now',
+            help='Drain in this process instead of queueing a job.',
+        )
+
+    def handle(self, *args, **options):
+        # Run periodically as a backstop for the job saves schedule
+        if options['now']:
+            counts = update_search_index()
+            for label, count in counts.items():
+                self.stdout.write("{0}: {saved} saved, {deleted} deleted.".format(
+                    label,
+                    **count
+                ))
+            return
+        update_search_index.delay()
+        self.stdout.write("Queued search index update.")
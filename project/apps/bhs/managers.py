@@ -1,14 +1,15 @@
+import io
+import logging
 import time
 from datetime import date
 
 # Third-Party
-from algoliasearch_django.decorators import disable_auto_indexing
-from openpyxl import Workbook
-from openpyxl.writer.excel import save_virtual_workbook
 from phonenumber_field.validators import validate_international_phonenumber
 
 # Django
 from django.apps import apps
+from django.db import connection
+from django.db import transaction
 from django.db.models import Manager
 from django.db.models import Q
 from django.db.models import F
@@ -21,14 +22,91 @@ from django.db.models import CharField
 from django.db.models import IntegerField
 from django.db.models import DateField
 from django.db.models import Case
-from django.core.files.base import ContentFile
+from django.db.models import Window
+from django.db.models.functions import RowNumber
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.utils.timezone import now
+
+# Local
+from .workbooks import get_displays
+from .workbooks import write_workbook
+
+log = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
-class PersonManager(Manager):
+class ReferenceManager(Manager):
+    def attach(self, objs, field, attr):
+        """
+        Resolve the bare ids in `field` across `objs` with a single query.
+
+        The matching instance (or None) is set on each object as `attr`.
+        """
+        objs = list(objs)
+        ids = set(getattr(obj, field) for obj in objs)
+        ids.discard(None)
+        resolved = self.in_bulk(ids) if ids else {}
+        for obj in objs:
+            setattr(obj, attr, resolved.get(getattr(obj, field)))
+        return objs
+
+    def get_orphans(self, live_ids, source='bhs'):
+        """
+        Ids of rows synced from `source` that are missing from `live_ids`.
+
+        The live ids are COPY-loaded into a temporary staging table and
+        anti-joined against source_id, so the list never becomes query
+        parameters.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        column = connection.ops.quote_name(
+            self.model._meta.get_field('source_id').column
+        )
+        pk = connection.ops.quote_name(self.model._meta.pk.column)
+        source_ids = set("{0}|{1}".format(source, x) for x in live_ids)
+        buffer = io.StringIO("".join(
+            "{0}\n".format(x) for x in source_ids
+        ))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS orphan_staging")
+            cursor.execute(
+                "CREATE TEMPORARY TABLE orphan_staging "
+                "(source_id varchar(100) PRIMARY KEY) ON COMMIT DROP"
+            )
+            cursor.copy_expert(
+                "COPY orphan_staging (source_id) FROM STDIN",
+                buffer,
+            )
+            cursor.execute(
+                "SELECT t.{pk} FROM {table} t "
+                "WHERE t.{column} LIKE %s AND NOT EXISTS ("
+                "SELECT 1 FROM orphan_staging s WHERE s.source_id = t.{column}"
+                ")".format(pk=pk, table=table, column=column),
+                ["{0}|%".format(source)],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def delete_orphans(self, live_ids, source='bhs', dry_run=False, batch_size=1000):
+        """
+        Delete rows that no longer exist upstream, in bounded batches.
+
+        With `dry_run` nothing is deleted; the orphans are only logged.
+        Returns the number of orphans found.
+        """
+        orphans = self.get_orphans(live_ids, source=source)
+        if dry_run:
+            for orphan in self.filter(pk__in=orphans).values_list('source_id', flat=True).iterator():
+                log.info("{0}: orphan {1}".format(self.model._meta.label, orphan))
+            return len(orphans)
+        for i in range(0, len(orphans), batch_size):
+            # Each batch cascades and commits on its own
+            self.filter(pk__in=orphans[i:i + batch_size]).delete()
+        return len(orphans)
+
+
+class PersonManager(ReferenceManager):
     def update_or_create_from_human(self, human):
         # Extract
         if isinstance(human, dict):
@@ -165,17 +243,6 @@ class PersonManager(Manager):
         )
         return person, created
 
-    def delete_orphans(self, humans):
-        # Delete Orphans
-        orphans = self.filter(
-            mc_pk__isnull=False,
-        ).exclude(
-            mc_pk__in=humans,
-        )
-        t = orphans.count()
-        orphans.delete()
-        return t
-
     def export_orphans(self, cursor=None):
         ps = self.filter(
             email__isnull=True,
@@ -199,7 +266,7 @@ class PersonManager(Manager):
         return ps
 
 
-class GroupManager(Manager):
+class GroupManager(ReferenceManager):
     def update_or_create_from_structure(self, structure):
         # Extract
         if isinstance(structure, dict):
@@ -498,29 +565,16 @@ class GroupManager(Manager):
         )
         return group, created
 
-    def delete_orphans(self, structures):
-        # Delete Orphans
-        orphans = self.filter(
-            mc_pk__isnull=False,
-        ).exclude(
-            mc_pk__in=structures,
-        )
-        t = orphans.count()
-        orphans.delete()
-        return t
-
     def sort_tree(self):
         self.all().update(tree_sort=None)
         root = self.get(kind=self.model.KIND.international)
         i = 1
         root.tree_sort = i
-        with disable_auto_indexing(model=self.model):
-            root.save()
+        root.save()
         for child in root.children.order_by('kind', 'code', 'name'):
             i += 1
             child.tree_sort = i
-            with disable_auto_indexing(model=self.model):
-                child.save()
+            child.save()
         orgs = self.filter(
             kind__in=[
                 self.model.KIND.chapter,
@@ -534,8 +588,7 @@ class GroupManager(Manager):
         for org in orgs:
             i += 1
             org.tree_sort = i
-            with disable_auto_indexing(model=self.model):
-                org.save()
+            org.save()
         return
 
     def denormalize(self, cursor=None):
@@ -546,8 +599,7 @@ class GroupManager(Manager):
             )
         for group in groups:
             group.denormalize()
-            with disable_auto_indexing(model=self.model):
-                group.save()
+            group.save()
         return
 
     def update_seniors(self):
@@ -562,13 +614,10 @@ class GroupManager(Manager):
             is_senior = quartet.get_is_senior()
             if prior != is_senior:
                 quartet.is_senior = is_senior
-                with disable_auto_indexing(model=self.model):
-                    quartet.save()
+                quartet.save()
         return
 
     def get_quartets(self):
-        wb = Workbook()
-        ws = wb.active
         fieldnames = [
             'PK',
             'Name',
@@ -581,65 +630,83 @@ class GroupManager(Manager):
             'Code',
             'Status',
         ]
-        ws.append(fieldnames)
+        displays = get_displays(self.model, 'kind', 'status')
         groups = self.filter(
             status=self.model.STATUS.active,
             kind=self.model.KIND.quartet,
-        ).order_by('name')
-        for group in groups:
-            pk = str(group.pk)
-            name = group.name
-            kind = group.get_kind_display()
-            organization = "FIX"
-            district = group.district
-            chapters = group.chapters
-            is_senior = group.is_senior
-            is_youth = group.is_youth
-            bhs_id = group.bhs_id
-            code = group.code
-            status = group.get_status_display()
-            row = [
-                pk,
+        ).order_by(
+            'name',
+        ).values_list(
+            'id',
+            'name',
+            'kind',
+            'district',
+            'is_senior',
+            'is_youth',
+            'bhs_id',
+            'code',
+            'status',
+        ).iterator()
+        rows = (
+            [
+                str(pk),
                 name,
-                kind,
-                organization,
+                displays['kind'].get(kind, kind),
+                "FIX",
                 district,
-                chapters,
+                "",  # Chapters are no longer denormalized onto groups
                 is_senior,
                 is_youth,
                 bhs_id,
                 code,
-                status,
-            ]
-            ws.append(row)
-        file = save_virtual_workbook(wb)
-        content = ContentFile(file)
-        return content
+                displays['status'].get(status, status),
+            ] for pk, name, kind, district, is_senior, is_youth, bhs_id, code, status in groups
+        )
+        return write_workbook(fieldnames, rows)
 
 
-class AwardManager(Manager):
+class AwardManager(ReferenceManager):
     def sort_tree(self):
-        self.all().update(tree_sort=None)
-        awards = self.order_by(
-            '-status',  # Actives first
-            'district',  # Basic BHS Hierarchy
-            '-kind', # Quartet, Chorus
-            'gender', #Male, mixed
-            F('age').asc(nulls_first=True), # Null, Senior, Youth
-            'level', #Championship, qualifier
-            'is_novice',
-            'name', # alpha
+        """
+        Renumber tree_sort in one ordered pass.
+
+        Positions come from a single ROW_NUMBER() query and only rows whose
+        position moved are written back, in batches.
+        """
+        awards = self.annotate(
+            position=Window(
+                expression=RowNumber(),
+                order_by=[
+                    F('status').desc(),  # Actives first
+                    F('district').asc(),  # Basic BHS Hierarchy
+                    F('kind').desc(), # Quartet, Chorus
+                    F('gender').asc(), #Male, mixed
+                    F('age').asc(nulls_first=True), # Null, Senior, Youth
+                    F('level').asc(), #Championship, qualifier
+                    F('is_novice').asc(),
+                    F('name').asc(), # alpha
+                ],
+            ),
+        ).only(
+            'id',
+            'tree_sort',
         )
-        i = 0
+        stamp = now()
+        moved = []
         for award in awards:
-            i += 1
-            award.tree_sort = i
-            award.save()
-        return
+            if award.tree_sort != award.position:
+                award.tree_sort = award.position
+                award.modified = stamp
+                moved.append(award)
+        # Not part of the search index, so no reindex is needed
+        with transaction.atomic():
+            self.bulk_update(moved, [
+                'tree_sort',
+                'modified',
+            ], batch_size=1000)
+        return len(moved)
 
     def get_awards(self):
-        wb = Workbook()
-        ws = wb.active
         fieldnames = [
             'ID',
             'District',
@@ -655,49 +722,72 @@ class AwardManager(Manager):
             'Minimum',
             'Advance',
         ]
-        ws.append(fieldnames)
-        awards = self.select_related(
-            # 'group',
-        ).filter(
+        displays = get_displays(
+            self.model,
+            'district',
+            'division',
+            'kind',
+            'gender',
+            'season',
+            'level',
+        )
+        awards = self.filter(
             status__gt=0,
-        ).order_by('tree_sort')
-        for award in awards:
-            pk = str(award.id)
-            district = award.get_district_display()
-            division = award.get_division_display()
-            name = award.name
-            kind = award.get_kind_display()
-            gender = award.get_gender_display()
-            season = award.get_season_display()
-            level = award.get_level_display()
-            single = award.is_single
-            spots = award.spots
-            threshold = award.threshold
-            minimum = award.minimum
-            row = [
-                pk,
-                district,
-                division,
-                name,
-                kind,
-                gender,
-                season,
-                level,
-                single,
-                spots,
-                threshold,
-                minimum,
-            ]
-            ws.append(row)
-        file = save_virtual_workbook(wb)
-        content = ContentFile(file)
-        return content
+        ).order_by(
+            'tree_sort',
+        ).values(
+            'id',
+            'district',
+            'division',
+            'name',
+            'kind',
+            'gender',
+            'season',
+            'level',
+            'is_single',
+            'spots',
+            'threshold',
+            'minimum',
+        ).iterator()
+        rows = (
+            [
+                str(award['id']),
+                displays['district'].get(award['district'], award['district']),
+                displays['division'].get(award['division'], award['division']),
+                award['name'],
+                displays['kind'].get(award['kind'], award['kind']),
+                displays['gender'].get(award['gender'], award['gender']),
+                displays['season'].get(award['season'], award['season']),
+                displays['level'].get(award['level'], award['level']),
+                award['is_single'],
+                award['spots'],
+                award['threshold'],
+                award['minimum'],
+            ] for award in awards
+        )
+        return write_workbook(fieldnames, rows)
+
 
+class ChartManager(ReferenceManager):
+    def get_nomens(self, group_ids):
+        """Chart nomens for each group, ordered by title, in one query."""
+        nomens = {}
+        charts = self.filter(
+            groups__in=group_ids,
+        ).order_by(
+            'title',
+        ).values_list(
+            'groups__id',
+            'title',
+            'arrangers',
+        )
+        for group_id, title, arrangers in charts:
+            nomens.setdefault(group_id, []).append(
+                "{0} [{1}]".format(title, arrangers)
+            )
+        return nomens
 
-class ChartManager(Manager):
     def get_report(self):
-        wb = Workbook()
-        ws = wb.active
         fieldnames = [
             'PK',
             'Title',
@@ -707,27 +797,70 @@ class ChartManager(Manager):
             'Holders',
             'Status',
         ]
-        ws.append(fieldnames)
-        charts = self.order_by('title', 'arrangers')
-        for chart in charts:
-            pk = str(chart.pk)
-            title = chart.title
-            arrangers = chart.arrangers
-            composers = chart.composers
-            lyricists = chart.lyricists
-            holders = chart.holders
-            status = chart.get_status_display()
-            row = [
-                pk,
+        displays = get_displays(self.model, 'status')
+        charts = self.order_by(
+            'title',
+            'arrangers',
+        ).values_list(
+            'id',
+            'title',
+            'arrangers',
+            'composers',
+            'lyricists',
+            'holders',
+            'status',
+        ).iterator()
+        rows = (
+            [
+                str(pk),
                 title,
                 arrangers,
                 composers,
                 lyricists,
                 holders,
-                status,
-            ]
-            ws.append(row)
-        file = save_virtual_workbook(wb)
-        content = ContentFile(file)
-        return content
+                displays['status'].get(status, status),
+            ] for pk, title, arrangers, composers, lyricists, holders, status in charts
+        )
+        return write_workbook(fieldnames, rows)
+
+
+class CursorManager(Manager):
+    def get_cursor(self, resource):
+        return self.filter(
+            resource=resource,
+        ).values_list(
+            'cursor',
+            flat=True,
+        ).first()
+
+    def advance(self, resource, cursor):
+        # Only ever move forward
+        self.get_or_create(resource=resource)
+        return self.filter(
+            Q(cursor__lt=cursor) | Q(cursor__isnull=True),
+            resource=resource,
+        ).update(
+            cursor=cursor,
+            modified=now(),
+        )
+
+    def skip(self, resource, pks):
+        # Kept until the next sync fetches them again
+        self.get_or_create(resource=resource)
+        with transaction.atomic():
+            cursor = self.select_for_update().get(resource=resource)
+            cursor.skipped = sorted(set(cursor.skipped) | set(pks))
+            cursor.save()
+        return
 
+    def take_skipped(self, resource):
+        with transaction.atomic():
+            cursor = self.select_for_update().filter(
+                resource=resource,
+            ).first()
+            if not cursor or not cursor.skipped:
+                return []
+            skipped = cursor.skipped
+            cursor.skipped = []
+            cursor.save()
+        return skipped
@@ -0,0 +1,95 @@
+# Standard Library
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-Party
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Django
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+
+def get_session(token, workers=4, retries=5, backoff=0.5):
+    """
+    A pooled session authenticated against Member Center.
+
+    Connection errors and 429/5xx responses are retried with exponential
+    backoff.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': 'Token {0}'.format(token),
+    })
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=workers,
+        max_retries=retry,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_pages(path, params, workers=4, url=None):
+    """
+    Yield every page of a Member Center listing as parsed JSON.
+
+    The first page is read once for the page count; the rest are fetched
+    concurrently and yielded in page order as soon as each is available,
+    so callers can ingest a page while later ones are still in flight.
+    """
+    endpoint, _, token = (url or settings.MEMBERCENTER_URL).partition('@')
+    url = "{0}{1}".format(endpoint, path)
+    session = get_session(token, workers=workers)
+
+    def fetch(page):
+        response = session.get(
+            url,
+            params=dict(params, **{'page[number]': page}),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    with session:
+        first = fetch(1)
+        yield first
+        pages = first['meta']['pagination']['pages']
+        if pages < 2:
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(fetch, range(2, pages + 1)):
+                yield result
+
+
+def fetch_records(path, pks, workers=4, url=None):
+    """
+    Yield single Member Center records by id, fetched concurrently.
+
+    Records that no longer exist are logged and left out.
+    """
+    endpoint, _, token = (url or settings.MEMBERCENTER_URL).partition('@')
+    url = "{0}{1}".format(endpoint, path)
+    session = get_session(token, workers=workers)
+
+    def fetch(pk):
+        response = session.get("{0}/{1}".format(url, pk))
+        if response.status_code == 404:
+            log.warning("{0}/{1}: not found".format(path, pk))
+            return None
+        response.raise_for_status()
+        return response.json()['data']
+
+    with session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(fetch, pks):
+                if result:
+                    yield result
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.12 on 2020-04-15 10:03
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0007_auto_20190910_1139'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cursor',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('resource', models.CharField(help_text='\n            The Member Center resource being synced.', max_length=255, unique=True)),
+                ('cursor', models.DateTimeField(blank=True, help_text='\n            The latest modified stamp committed from the resource.', null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
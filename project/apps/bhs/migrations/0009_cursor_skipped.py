@@ -0,0 +1,19 @@
+# Generated by Django 2.2.12 on 2020-04-16 09:12
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0008_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cursor',
+            name='skipped',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, help_text='\n            Member Center ids that failed validation, to fetch again.', size=None),
+        ),
+    ]
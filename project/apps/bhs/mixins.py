@@ -0,0 +1,174 @@
+# Standard Library
+import hashlib
+
+# Third-Party
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import prefetch_related_objects
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+
+# Local
+from .permissions import get_permissions
+
+
+class ConditionalMixin(object):
+    """
+    ETag and Last-Modified validators for list and detail GETs.
+
+    Validators come from the max modified stamp and row count of the
+    filtered queryset, of every to-many relation the serializer renders
+    and of the parents its permissions read, plus the user's roles and
+    owned ids, so a matching If-None-Match is answered with a 304 before
+    anything is serialized.
+    """
+    # Relation paths whose state feeds the rendered permissions; defaults
+    # to the model's own foreign keys
+    conditional_parents = None
+
+    def get_conditional_sources(self):
+        model = self.get_queryset().model
+        sources = ['']
+        for name in self.get_serializer_class().Meta.fields:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and (field.one_to_many or field.many_to_many):
+                sources.append(name)
+        return sources
+
+    def get_conditional_parents(self):
+        if self.conditional_parents is not None:
+            return self.conditional_parents
+        return [
+            field.name for field in self.get_queryset().model._meta.concrete_fields
+            if field.many_to_one
+        ]
+
+    def get_parent_aggregates(self, model):
+        aggregates = {}
+        models = [model]
+        for path in self.get_conditional_parents():
+            parent = model
+            for name in path.split('__'):
+                parent = parent._meta.get_field(name).related_model
+            models.append(parent)
+            for name in ['modified', 'status']:
+                try:
+                    parent._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                aggregates["{0}__{1}".format(path, name)] = Max(
+                    "{0}__{1}".format(path, name)
+                )
+        return aggregates, models
+
+    def get_access_parts(self, models):
+        # Roles and ownership decide the permissions block
+        context = get_permissions(self.request)
+        parts = [",".join(sorted(context.roles))]
+        for model in models:
+            try:
+                model._meta.get_field('owners')
+            except FieldDoesNotExist:
+                continue
+            parts.append(",".join(sorted(str(x) for x in context.get_owned(model))))
+        return parts
+
+    def get_validators(self, queryset):
+        queryset = queryset.order_by()
+        parts = [
+            self.request.get_full_path(),
+            self.request.META.get('HTTP_ACCEPT', ''),
+            str(self.request.user.pk),
+        ]
+        parent_aggregates, models = self.get_parent_aggregates(queryset.model)
+        if self.request.user.is_authenticated:
+            parts.extend(self.get_access_parts(models))
+        last_modified = None
+        for source in self.get_conditional_sources():
+            model = queryset.model
+            prefix = ''
+            if source:
+                model = model._meta.get_field(source).related_model
+                prefix = "{0}__".format(source)
+            aggregates = {
+                'cnt': Count(source or 'pk'),
+            }
+            if not source:
+                aggregates.update(parent_aggregates)
+            try:
+                model._meta.get_field('modified')
+                aggregates['max'] = Max("{0}modified".format(prefix))
+            except FieldDoesNotExist:
+                pass
+            stamp = queryset.aggregate(**aggregates)
+            parts.append("|".join(
+                "{0}={1}".format(key, stamp[key]) for key in sorted(stamp)
+            ))
+            stamps = [
+                value for key, value in stamp.items()
+                if (key == 'max' or key.endswith('__modified')) and value
+            ]
+            if stamps and (not last_modified or max(stamps) > last_modified):
+                last_modified = max(stamps)
+        etag = hashlib.sha1(":".join(parts).encode()).hexdigest()
+        if last_modified:
+            last_modified = int(last_modified.timestamp())
+        return quote_etag(etag), last_modified
+
+    def get_conditional_response(self, request, queryset, render):
+        etag, last_modified = self.get_validators(queryset)
+        # A date alone can't see deletes, so it only counts alongside an ETag
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified if request.META.get('HTTP_IF_NONE_MATCH') else None,
+        )
+        if response is not None:
+            return response
+        response = render()
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_conditional_response(
+            request,
+            queryset,
+            lambda: super(ConditionalMixin, self).list(request, *args, **kwargs),
+        )
+
+    def get_conditional_object(self):
+        """Look up and permission-check the object without the prefetches."""
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = get_object_or_404(
+            queryset,
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    def retrieve(self, request, *args, **kwargs):
+        # Resolve first so permissions are checked before any 304
+        instance = self.get_conditional_object()
+        queryset = self.get_queryset().filter(pk=instance.pk)
+
+        def render():
+            # Only a full response pays for the serializer's prefetches
+            prefetch_related_objects(
+                [instance],
+                *self.get_queryset()._prefetch_related_lookups
+            )
+            return Response(self.get_serializer(instance).data)
+        return self.get_conditional_response(request, queryset, render)
@@ -31,6 +31,8 @@ from .managers import AwardManager
 from .managers import PersonManager
 from .managers import GroupManager
 from .managers import ChartManager
+from .managers import CursorManager
+from .permissions import get_permissions
 
 from .fields import LowerEmailField
 from .fields import ImageUploadPath
@@ -349,20 +351,12 @@ class Award(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC')
 
     # Transitions
     @fsm_log_by
@@ -509,24 +503,14 @@ class Chart(TimeStampedModel):
     @authenticated_users
     def has_write_permission(request):
         return any([
-            request.user.roles.filter(
-                name__in=[
-                    'SCJC',
-                    'Librarian',
-                ],
-            )
+            get_permissions(request).has_role('SCJC', 'Librarian')
         ])
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         return any([
-            request.user.roles.filter(
-                name__in=[
-                    'SCJC',
-                    'Librarian',
-                ],
-            )
+            get_permissions(request).has_role('SCJC', 'Librarian')
         ])
 
     # Transitions
@@ -861,19 +845,14 @@ class Convention(TimeStampedModel):
     @authenticated_users
     def has_write_permission(request):
         return any([
-            request.user.roles.filter(name__in=[
-                'SCJC',
-                ]
-            )
+            get_permissions(request).has_role('SCJC')
         ])
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         return any([
-            request.user.roles.filter(name__in=[
-                'SCJC',
-            ])
+            get_permissions(request).has_role('SCJC')
         ])
 
     # Convention Transition Conditions
@@ -955,6 +934,44 @@ class Convention(TimeStampedModel):
         return
 
 
+class Cursor(TimeStampedModel):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+
+    resource = models.CharField(
+        help_text="""
+            The Member Center resource being synced.""",
+        max_length=255,
+        unique=True,
+    )
+
+    cursor = models.DateTimeField(
+        help_text="""
+            The latest modified stamp committed from the resource.""",
+        null=True,
+        blank=True,
+    )
+
+    skipped = ArrayField(
+        base_field=models.CharField(
+            max_length=255,
+        ),
+        help_text="""
+            Member Center ids that failed validation, to fetch again.""",
+        default=list,
+        blank=True,
+    )
+
+    # Internals
+    objects = CursorManager()
+
+    def __str__(self):
+        return self.resource
+
+
 class Group(TimeStampedModel):
     id = models.UUIDField(
         primary_key=True,
@@ -1257,11 +1274,11 @@ class Group(TimeStampedModel):
         ])
 
     def get_owner_ids(self):
-        return list(self.owners.values_list('id', flat=True))
+        return [x.id for x in self.owners.all()]
 
 
     def get_chart_ids(self):
-        return list(self.charts.values_list('id', flat=True))
+        return [x.id for x in self.charts.all()]
 
 
     def get_owners_emails(self):
@@ -1382,25 +1399,14 @@ class Group(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'Librarian',
-                'Manager',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'Librarian', 'Manager')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         return any([
-            request.user.roles.filter(
-                name__in=[
-                    'SCJC',
-                    'Librarian',
-                ]
-            ),
-            request.user in self.owners.all(),
+            get_permissions(request).has_role('SCJC', 'Librarian'),
+            get_permissions(request).owns(self),
         ])
 
     # Conditions:
@@ -1698,20 +1704,12 @@ class Person(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC')
 
     # Transitions
     @fsm_log_by
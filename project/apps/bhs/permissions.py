@@ -0,0 +1,52 @@
+# Django
+from django.utils.functional import cached_property
+
+
+class PermissionContext(object):
+    """
+    The user's role names and owned object ids for a single request.
+
+    Roles load once, and so do the ids the user owns of each owning model
+    (rounds, sessions, groups...), so object checks across a whole list
+    response are answered from memory.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.owned = {}
+
+    @cached_property
+    def roles(self):
+        return set(self.user.roles.values_list('name', flat=True))
+
+    def has_role(self, *names):
+        return bool(self.roles.intersection(names))
+
+    def get_owned(self, model):
+        if model not in self.owned:
+            self.owned[model] = set(model.objects.filter(
+                owners=self.user,
+            ).values_list('id', flat=True))
+        return self.owned[model]
+
+    def owns(self, instance, path=None):
+        """
+        Whether the user owns `instance`, or the object `path` leads to.
+
+        `path` follows relations from the instance, e.g. 'appearance__round'.
+        """
+        if not path:
+            return instance.pk in self.get_owned(type(instance))
+        *parents, name = path.split('__')
+        for parent in parents:
+            instance = getattr(instance, parent)
+        field = instance._meta.get_field(name)
+        return getattr(instance, field.attname) in self.get_owned(field.related_model)
+
+
+def get_permissions(request):
+    context = getattr(request, '_permission_context', None)
+    if context is None or context.user != request.user:
+        context = PermissionContext(request.user)
+        request._permission_context = context
+    return context
@@ -0,0 +1,110 @@
+# Standard Library
+import logging
+
+# Third-Party
+from algoliasearch.helpers import AlgoliaException
+from algoliasearch_django import algolia_engine
+from django_redis import get_redis_connection
+
+# Django
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+# Held from the first dirty mark until the drain job starts, so every
+# save in between rides on one job.  Expires in case a job is lost.
+SCHEDULE_KEY = "search:scheduled"
+SCHEDULE_TIMEOUT = 60 * 5
+
+
+def get_dirty_key(model):
+    return "search:dirty:{0}".format(model._meta.label_lower)
+
+
+def mark_dirty(model, pks):
+    """Queue ids for reindexing once the transaction commits."""
+    pks = [str(x) for x in pks]
+    if not pks:
+        return
+
+    def mark():
+        connection = get_redis_connection('default')
+        connection.sadd(get_dirty_key(model), *pks)
+        if connection.set(SCHEDULE_KEY, 1, nx=True, ex=SCHEDULE_TIMEOUT):
+            from .tasks import update_search_index
+            update_search_index.delay()
+    transaction.on_commit(mark)
+    return
+
+
+def pop_dirty(model):
+    """Take every queued id for a model in one atomic step."""
+    pipe = get_redis_connection('default').pipeline()
+    pipe.smembers(get_dirty_key(model))
+    pipe.delete(get_dirty_key(model))
+    pks, _ = pipe.execute()
+    return [x.decode() for x in pks]
+
+
+def should_index(instance):
+    """Every registered index gates on the model's is_searchable()."""
+    return bool(instance.is_searchable())
+
+
+def drain_search_index(model, batch_size=1000):
+    """
+    Push a model's queued ids to Algolia in batches.
+
+    Rows are loaded with the index's prefetches so the searchable checks
+    and records build in memory; ids whose rows are gone, or no longer
+    searchable, are deleted.  A failed batch is queued again.
+    """
+    adapter = algolia_engine.get_adapter(model)
+    index = algolia_engine.client.init_index(adapter.index_name)
+    counts = {
+        'saved': 0,
+        'deleted': 0,
+    }
+    pks = pop_dirty(model)
+    for i in range(0, len(pks), batch_size):
+        batch = pks[i:i + batch_size]
+        instances = model.objects.filter(
+            pk__in=batch,
+        ).prefetch_related(
+            *getattr(adapter, 'prefetch_related', [])
+        )
+        records = []
+        found = set()
+        deletes = []
+        for instance in instances:
+            found.add(str(instance.pk))
+            if should_index(instance):
+                records.append(adapter.get_raw_record(instance))
+            else:
+                deletes.append(str(adapter.objectID(instance)))
+        deletes.extend(x for x in batch if x not in found)
+        try:
+            if records:
+                index.save_objects(records)
+            if deletes:
+                index.delete_objects(deletes)
+        except AlgoliaException as e:
+            log.warning("{0}: {1}".format(model._meta.label, e))
+            get_redis_connection('default').sadd(get_dirty_key(model), *batch)
+            continue
+        counts['saved'] += len(records)
+        counts['deleted'] += len(deletes)
+    return counts
+
+
+def save_receiver(sender, instance, **kwargs):
+    mark_dirty(sender, [instance.pk])
+
+
+def m2m_receiver(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        mark_dirty(instance.__class__, [instance.pk])
+    elif pk_set:
+        mark_dirty(model, pk_set)
@@ -1,11 +1,11 @@
 
 # Third-Party
-from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework_json_api import serializers
 from rest_framework_json_api.relations import ResourceRelatedField
 from django.contrib.auth import get_user_model
 
 # Local
+from .fields import PermissionsField
 from .fields import TimezoneField
 
 from .models import Award
@@ -17,7 +17,7 @@ from .models import Person
 User = get_user_model()
 
 class AwardSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Award
@@ -55,7 +55,7 @@ class AwardSerializer(serializers.ModelSerializer):
 
 
 class ChartSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     included_serializers = {
     }
@@ -80,7 +80,7 @@ class ChartSerializer(serializers.ModelSerializer):
 
 class ConventionSerializer(serializers.ModelSerializer):
     timezone = TimezoneField(allow_null=True)
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Convention
@@ -124,7 +124,7 @@ class ConventionSerializer(serializers.ModelSerializer):
 
 
 class GroupSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     included_serializers = {
         'charts': 'apps.bhs.serializers.ChartSerializer',
         # 'members': 'apps.bhs.serializers.MemberSerializer',
@@ -164,7 +164,7 @@ class GroupSerializer(serializers.ModelSerializer):
 
 
 class PersonSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     # owners = ResourceRelatedField(
     #     queryset=User.objects,
     #     many=True,
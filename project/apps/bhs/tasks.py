@@ -1,11 +1,20 @@
 import requests
 
+from algoliasearch_django import algolia_engine
 from django_rq import job
+from django_redis import get_redis_connection
 from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
 #
 from .serializers import PersonSerializer
 from .serializers import GroupSerializer
+from .search import SCHEDULE_KEY
+from .search import drain_search_index
+from .search import mark_dirty
 from rest_framework_json_api.parsers import JSONParser
 from django.contrib.auth import get_user_model
 
@@ -67,6 +76,130 @@ def update_group_from_membercenter(resource):
     raise ValueError(serialized.errors)
 
 
+def update_page_from_membercenter(model, serializer, resources):
+    """
+    Upsert a page of Member Center resources with bulk writes.
+
+    Existing rows are matched on `source_id` in one query; invalid
+    resources are logged and skipped rather than failing the page.
+    """
+    fields = [
+        x for x in serializer.Meta.fields
+        if x not in serializer.Meta.read_only_fields
+        and x not in ['id', 'source_id', 'owners', 'charts', 'permissions']
+    ]
+    source_ids = ["bhs|{0}".format(x['id']) for x in resources]
+    existing = model.objects.in_bulk(source_ids, field_name='source_id')
+    creates = []
+    updates = []
+    instances = {}
+    for source_id, resource in zip(source_ids, resources):
+        instance = existing.get(source_id) or model(source_id=source_id)
+        attributes = resource['attributes']
+        for field in fields:
+            if field in attributes:
+                setattr(instance, field, attributes[field])
+        try:
+            instance.clean_fields()
+        except ValidationError as e:
+            log.error("{0}: {1}".format(source_id, e))
+            continue
+        if source_id in existing:
+            instance.modified = now()
+            updates.append(instance)
+        else:
+            creates.append(instance)
+        instances[source_id] = instance
+    with transaction.atomic():
+        model.objects.bulk_create(creates)
+        model.objects.bulk_update(updates, fields + ['modified'])
+    # Bulk writes skip the indexing signal
+    if settings.ALGOLIA.get('DEFERRED_INDEXING'):
+        mark_dirty(model, [x.pk for x in creates + updates])
+    return instances
+
+
+@job('low')
+def update_search_index():
+    # Saves from here on schedule a fresh job
+    get_redis_connection('default').delete(SCHEDULE_KEY)
+    return {
+        model._meta.label: drain_search_index(model)
+        for model in algolia_engine.get_registered_models()
+    }
+
+
+def advance_cursor_from_membercenter(resource, resources, instances):
+    # Called once the page has committed
+    Cursor = apps.get_model('bhs.cursor')
+    # Rows that failed validation are fetched again on the next sync
+    skipped = [
+        x['id'] for x in resources
+        if "bhs|{0}".format(x['id']) not in instances
+    ]
+    if skipped:
+        Cursor.objects.skip(resource, skipped)
+    stamps = [
+        parse_datetime(x['attributes']['modified'])
+        for x in resources if x['attributes'].get('modified')
+    ]
+    if stamps:
+        Cursor.objects.advance(resource, max(stamps))
+    return
+
+
+@job('low')
+def update_persons_from_membercenter(resources, cursor=None):
+    Person = apps.get_model('bhs.person')
+    instances = update_page_from_membercenter(
+        Person,
+        PersonSerializer,
+        resources,
+    )
+    if cursor:
+        advance_cursor_from_membercenter(cursor, resources, instances)
+    return len(instances)
+
+
+@job('low')
+def update_groups_from_membercenter(resources, cursor=None):
+    Group = apps.get_model('bhs.group')
+    User = get_user_model()
+    instances = update_page_from_membercenter(
+        Group,
+        GroupSerializer,
+        resources,
+    )
+    # Replace owners for the page through the join table
+    owners = {}
+    for resource in resources:
+        source_id = "bhs|{0}".format(resource['id'])
+        if source_id in instances:
+            owners[instances[source_id].id] = [
+                x['id'] for x in resource['relationships']['owners']['data']
+            ]
+    users = set(str(x) for x in User.objects.filter(
+        id__in=[x for ids in owners.values() for x in ids],
+    ).values_list('id', flat=True))
+    Through = Group.owners.through
+    with transaction.atomic():
+        Through.objects.filter(
+            group_id__in=owners.keys(),
+        ).delete()
+        Through.objects.bulk_create([
+            Through(
+                group_id=group_id,
+                user_id=user_id,
+            ) for group_id, ids in owners.items() for user_id in ids if user_id in users
+        ])
+    # Owners feed the search records
+    if settings.ALGOLIA.get('DEFERRED_INDEXING'):
+        mark_dirty(Group, owners.keys())
+    if cursor:
+        advance_cursor_from_membercenter(cursor, resources, instances)
+    return len(instances)
+
+
 @job('low')
 def update_group_owners_from_membercenter(resource):
     Group = apps.get_model('bhs.group')
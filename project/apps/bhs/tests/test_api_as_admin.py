@@ -4,8 +4,13 @@ import pytest
 from rest_framework import status
 
 # Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+# Local
+from .factories import AwardFactory
+
 pytestmark = pytest.mark.django_db
 
 
@@ -63,3 +68,38 @@ def test_person_endpoint(admin_api_client, person, django_assert_max_num_queries
         response = admin_api_client.get(path)
         assert response.status_code == status.HTTP_200_OK
 
+
+
+def test_conditional_get(admin_api_client, award):
+    for path in [reverse('award-list'), reverse('award-detail', args=(str(award.id),))]:
+        response = admin_api_client.get(path)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+        response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        award.name = 'Changed'
+        award.save()
+        response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+
+def test_conditional_get_needs_etag(admin_api_client, award):
+    AwardFactory()
+    path = reverse('award-list')
+    response = admin_api_client.get(path)
+    last_modified = response['Last-Modified']
+    award.delete()
+    # A delete leaves the newest stamp alone; only the ETag sees it
+    response = admin_api_client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_conditional_detail_skips_prefetches(admin_api_client, group):
+    path = reverse('group-detail', args=(str(group.id),))
+    with CaptureQueriesContext(connection) as full:
+        response = admin_api_client.get(path)
+    etag = response['ETag']
+    with CaptureQueriesContext(connection) as cached:
+        response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(cached) < len(full)
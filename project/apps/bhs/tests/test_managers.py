@@ -0,0 +1,29 @@
+# Third-Party
+import pytest
+
+# First-Party
+from apps.bhs.models import Person
+
+# Local
+from .factories import PersonFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_delete_orphans():
+    kept = PersonFactory(source_id='bhs|1')
+    orphan = PersonFactory(source_id='bhs|2')
+    # Rows from other sources, or never synced, are not orphans
+    other = PersonFactory(source_id='legacy|2')
+    local = PersonFactory(source_id=None)
+    assert Person.objects.get_orphans(['1', '3']) == [orphan.id]
+
+    assert Person.objects.delete_orphans(['1', '3'], dry_run=True) == 1
+    assert Person.objects.count() == 4
+
+    assert Person.objects.delete_orphans(['1', '3'], batch_size=1) == 1
+    assert set(Person.objects.values_list('id', flat=True)) == {
+        kept.id,
+        other.id,
+        local.id,
+    }
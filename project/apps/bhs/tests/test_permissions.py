@@ -0,0 +1,18 @@
+# Third-Party
+import pytest
+from rest_framework.test import APIRequestFactory
+
+# First-Party
+from apps.bhs.permissions import get_permissions
+
+pytestmark = pytest.mark.django_db
+
+
+def test_permissions_load_once_per_request(user, group, django_assert_num_queries):
+    group.owners.add(user)
+    request = APIRequestFactory().get('/')
+    request.user = user
+    with django_assert_num_queries(2):
+        for _ in range(10):
+            assert not get_permissions(request).has_role('SCJC', 'Librarian')
+            assert get_permissions(request).owns(group)
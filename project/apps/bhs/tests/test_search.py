@@ -0,0 +1,70 @@
+# Third-Party
+import pytest
+from algoliasearch.helpers import AlgoliaException
+from algoliasearch_django import algolia_engine
+from django_redis import get_redis_connection
+
+# First-Party
+from apps.bhs.models import Award
+from apps.bhs.search import SCHEDULE_KEY
+from apps.bhs.search import drain_search_index
+from apps.bhs.search import mark_dirty
+from apps.bhs.search import pop_dirty
+
+# Local
+from .factories import AwardFactory
+
+# Marks are pushed on commit, so the test needs real commits
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class StubIndex(object):
+    fail = False
+
+    def __init__(self):
+        self.saved = []
+        self.deleted = []
+
+    def save_objects(self, records):
+        if self.fail:
+            raise AlgoliaException("Unavailable")
+        self.saved.extend(x['objectID'] for x in records)
+
+    def delete_objects(self, ids):
+        self.deleted.extend(ids)
+
+
+@pytest.fixture
+def stub_index(monkeypatch):
+    index = StubIndex()
+    monkeypatch.setattr(algolia_engine.client, 'init_index', lambda name: index)
+    connection = get_redis_connection('default')
+    # Hold the schedule so marking doesn't queue a drain job
+    connection.set(SCHEDULE_KEY, 1)
+    pop_dirty(Award)
+    yield index
+    pop_dirty(Award)
+    connection.delete(SCHEDULE_KEY)
+
+
+def test_drain_search_index(stub_index):
+    active = AwardFactory()
+    inactive = AwardFactory(status=Award.STATUS.inactive)
+    gone = AwardFactory()
+    mark_dirty(Award, [active.pk, inactive.pk, gone.pk])
+    gone_id = str(gone.pk)
+    gone.delete()
+    counts = drain_search_index(Award)
+    assert stub_index.saved == [str(active.pk)]
+    assert sorted(stub_index.deleted) == sorted([str(inactive.pk), gone_id])
+    assert counts == {'saved': 1, 'deleted': 2}
+    assert pop_dirty(Award) == []
+
+
+def test_drain_search_index_requeues_failures(stub_index):
+    stub_index.fail = True
+    award = AwardFactory()
+    mark_dirty(Award, [award.pk])
+    counts = drain_search_index(Award)
+    assert counts == {'saved': 0, 'deleted': 0}
+    assert pop_dirty(Award) == [str(award.pk)]
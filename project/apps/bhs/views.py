@@ -27,6 +27,7 @@ from .filtersets import GroupFilterset
 from .filtersets import PersonFilterset
 from .filtersets import ChartFilterset
 # from .filterbackends import RepertoryFilterBackend
+from .mixins import ConditionalMixin
 from .models import Award
 from .models import Group
 from .models import Person
@@ -63,7 +64,7 @@ class IgnoreClientContentNegotiation(BaseContentNegotiation):
         return (renderers[0], renderers[0].media_type)
 
 
-class ConventionViewSet(viewsets.ModelViewSet):
+class ConventionViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Convention.objects.all()
     serializer_class = ConventionSerializer
     filterset_class = ConventionFilterset
@@ -102,7 +103,7 @@ class ConventionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AwardViewSet(viewsets.ModelViewSet):
+class AwardViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Award.objects.all()
     serializer_class = AwardSerializer
     filterset_class = None
@@ -158,7 +159,7 @@ class AwardViewSet(viewsets.ModelViewSet):
         )
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     filterset_class = GroupFilterset
@@ -238,7 +239,7 @@ class GroupViewSet(viewsets.ModelViewSet):
         )
 
 
-class PersonViewSet(viewsets.ModelViewSet):
+class PersonViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
     filterset_class = PersonFilterset
@@ -277,7 +278,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ChartViewSet(viewsets.ModelViewSet):
+class ChartViewSet(ConditionalMixin, viewsets.ModelViewSet):
     queryset = Chart.objects.all()
     serializer_class = ChartSerializer
     filterset_class = ChartFilterset
@@ -0,0 +1,34 @@
+# Standard Library
+from tempfile import TemporaryFile
+
+# Third-Party
+from openpyxl import Workbook
+
+# Django
+from django.core.files.base import ContentFile
+
+
+def get_displays(model, *names):
+    """Display maps for choice fields, as `get_FOO_display` would use."""
+    return {
+        name: dict(model._meta.get_field(name).flatchoices) for name in names
+    }
+
+
+def write_workbook(fieldnames, rows, name='workbook.xlsx'):
+    """
+    Write rows to an xlsx file using openpyxl's write-only mode.
+
+    Rows are flushed to a temporary file as they are appended, so memory
+    stays flat however many there are.  The result is a ContentFile that
+    can be saved to storage, attached or returned as a response.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(fieldnames)
+    for row in rows:
+        ws.append(row)
+    with TemporaryFile() as file:
+        wb.save(file)
+        file.seek(0)
+        return ContentFile(file.read(), name=name)
@@ -5,7 +5,6 @@ import datetime
 
 # Third-Party
 from django_fsm import FSMIntegerField
-from django.core.files.base import ContentFile
 from django_fsm import transition
 from django_fsm_log.decorators import fsm_log_by
 from django_fsm_log.models import StateLog
@@ -14,8 +13,6 @@ from dry_rest_permissions.generics import authenticated_users
 from model_utils import Choices
 from model_utils.models import TimeStampedModel
 from cloudinary_storage.storage import RawMediaCloudinaryStorage
-from openpyxl import Workbook
-from openpyxl.writer.excel import save_virtual_workbook
 from timezone_field import TimeZoneField
 from phonenumber_field.modelfields import PhoneNumberField
 from django.contrib.postgres.fields import JSONField
@@ -26,6 +23,7 @@ from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Avg
+from django.db.models import Prefetch
 from django.db.models import Q
 from django.db.models import Func
 from django.db.models import F
@@ -54,6 +52,8 @@ from .tasks import send_package_report_email_from_session
 
 
 from apps.adjudication.tasks import build_rounds_from_session
+from apps.bhs.permissions import get_permissions
+from apps.bhs.workbooks import write_workbook
 
 
 class Assignment(TimeStampedModel):
@@ -261,17 +261,13 @@ class Assignment(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC')
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
         return any([
-            request.user in self.session.owners.all(),
+            get_permissions(request).owns(self, 'session'),
         ])
 
 
@@ -555,12 +551,7 @@ class Contest(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'DRCJ',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'DRCJ')
 
     @allow_staff_or_superuser
     @authenticated_users
@@ -568,7 +559,7 @@ class Contest(TimeStampedModel):
         if self.session.status >= self.session.STATUS.opened:
             return False
         return any([
-            request.user in self.session.owners.all(),
+            get_permissions(request).owns(self, 'session'),
         ])
 
 
@@ -979,9 +970,9 @@ class Entry(TimeStampedModel):
         if self.session.status >= self.session.STATUS.packaged:
             return False
         return any([
-            request.user in self.session.owners.all(),
+            get_permissions(request).owns(self, 'session'),
             all([
-                request.user in self.owners.all(),
+                get_permissions(request).owns(self),
                 self.status < self.STATUS.approved,
             ])
         ])
@@ -1644,8 +1635,7 @@ class Session(TimeStampedModel):
 
     def get_legacy_report(self):
         Group = apps.get_model('bhs.group')
-        wb = Workbook()
-        ws = wb.active
+        Chart = apps.get_model('bhs.chart')
         fieldnames = [
             'oa',
             'group_id',
@@ -1654,14 +1644,20 @@ class Session(TimeStampedModel):
             'song_number',
             'song_title',
         ]
-        ws.append(fieldnames)
         entries = self.entries.filter(
             status__in=[
                 Entry.STATUS.approved,
             ]
-        ).order_by('draw')
+        ).order_by('draw').only(
+            'id',
+            'draw',
+            'group_id',
+        )
+        entries = Group.objects.attach(entries, 'group_id', 'group_patched')
+        nomens = Chart.objects.get_nomens([x.group_id for x in entries])
+        rows = []
         for entry in entries:
-            group = Group.objects.get(id=entry.group_id)
+            group = entry.group_patched
             oa = entry.draw
             group_name = group.name
             group_type = group.get_kind_display()
@@ -1675,11 +1671,8 @@ class Session(TimeStampedModel):
                 raise RuntimeError(
                     "Improper Entity Type: {0}".format(group.get_kind_display())
                 )
-            i = 0
-            charts_sorted = group.get_charts_nomens()
-            for chart in charts_sorted:
-                i += 1
-                song_number = i
+            charts_sorted = nomens.get(group.id, [])
+            for song_number, chart in enumerate(charts_sorted, start=1):
                 song_title = chart.partition("[")[0]
                 row = [
                     oa,
@@ -1689,10 +1682,8 @@ class Session(TimeStampedModel):
                     song_number,
                     song_title,
                 ]
-                ws.append(row)
-        file = save_virtual_workbook(wb)
-        content = ContentFile(file)
-        return content
+                rows.append(row)
+        return write_workbook(fieldnames, rows)
 
     def save_legacy_report(self):
         content = self.get_legacy_report()
@@ -1700,8 +1691,8 @@ class Session(TimeStampedModel):
 
     def get_drcj_report(self):
         Group = apps.get_model('bhs.group')
-        wb = Workbook()
-        ws = wb.active
+        Chart = apps.get_model('bhs.chart')
+        User = get_user_model()
         fieldnames = [
             'OA',
             'Group Name',
@@ -1716,14 +1707,25 @@ class Session(TimeStampedModel):
             'Charts(s)',
             'Contacts(s)',
         ]
-        ws.append(fieldnames)
         entries = self.entries.filter(
             status__in=[
                 Entry.STATUS.approved,
             ]
-        ).order_by('draw')
+        ).order_by('draw').prefetch_related(
+            Prefetch(
+                'contests',
+                queryset=Contest.objects.order_by('tree_sort'),
+            ),
+            Prefetch(
+                'owners',
+                queryset=User.objects.order_by('last_name', 'first_name'),
+            ),
+        )
+        entries = Group.objects.attach(entries, 'group_id', 'group_patched')
+        nomens = Chart.objects.get_nomens([x.group_id for x in entries])
+        rows = []
         for entry in entries:
-            group = Group.objects.get(id=entry.group_id)
+            group = entry.group_patched
             oa = entry.draw
             group_name = group.name
             bhs_id = group.bhs_id
@@ -1737,13 +1739,18 @@ class Session(TimeStampedModel):
             award_names = "\n".join(
                 filter(
                     None,
-                    ["{0}".format(i.name) for i in entry.contests.order_by('tree_sort')],
+                    ["{0}".format(i.name) for i in entry.contests.all()],
                 )
             )
 
-            chart_titles = "\n".join(group.get_charts_nomens())
+            chart_titles = "\n".join(nomens.get(group.id, []))
 
-            contact_emails = "\n".join(entry.get_owners_emails())
+            owners = entry.owners.all()
+            if not owners:
+                raise ValueError("No owners for {0}".format(entry))
+            contact_emails = "\n".join(
+                ["{0} <{1}>".format(x.name, x.email) for x in owners]
+            )
 
             row = [
                 oa,
@@ -1759,10 +1766,8 @@ class Session(TimeStampedModel):
                 chart_titles,
                 contact_emails,
             ]
-            ws.append(row)
-        file = save_virtual_workbook(wb)
-        content = ContentFile(file)
-        return content
+            rows.append(row)
+        return write_workbook(fieldnames, rows)
 
     def save_drcj_report(self):
         content = self.get_drcj_report()
@@ -2008,12 +2013,7 @@ class Session(TimeStampedModel):
     @allow_staff_or_superuser
     @authenticated_users
     def has_write_permission(request):
-        return bool(request.user.roles.filter(
-            name__in=[
-                'SCJC',
-                'DRCJ',
-            ]
-        ))
+        return get_permissions(request).has_role('SCJC', 'DRCJ')
 
     @allow_staff_or_superuser
     @authenticated_users
@@ -2021,7 +2021,7 @@ class Session(TimeStampedModel):
         if self.status >= self.STATUS.packaged:
             return False
         return bool(any([
-            request.user in self.owners.all(),
+            get_permissions(request).owns(self),
         ]))
 
 
@@ -1,8 +1,10 @@
 
 # Third-Party
-from dry_rest_permissions.generics import DRYPermissionsField
 from rest_framework_json_api import serializers
 
+# First-Party
+from apps.bhs.fields import PermissionsField
+
 # Local
 
 from .models import Assignment
@@ -12,7 +14,7 @@ from .models import Session
 
 
 class AssignmentSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Assignment
@@ -44,7 +46,7 @@ class AssignmentSerializer(serializers.ModelSerializer):
 
 
 class ContestSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     class Meta:
         model = Contest
@@ -76,7 +78,7 @@ class ContestSerializer(serializers.ModelSerializer):
 
 
 class EntrySerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
 
     statelogs = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -134,7 +136,7 @@ class EntrySerializer(serializers.ModelSerializer):
 
 
 class SessionSerializer(serializers.ModelSerializer):
-    permissions = DRYPermissionsField()
+    permissions = PermissionsField()
     statelogs = serializers.PrimaryKeyRelatedField(
         many=True,
         read_only=True,
@@ -6,6 +6,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_json_api import views
 
+# First-Party
+from apps.bhs.mixins import ConditionalMixin
+
 # Local
 from .filtersets import EntryFilterset
 from .filtersets import SessionFilterset
@@ -22,7 +25,7 @@ from .serializers import EntrySerializer
 from .serializers import SessionSerializer
 
 
-class AssignmentViewSet(views.ModelViewSet):
+class AssignmentViewSet(ConditionalMixin, views.ModelViewSet):
     queryset = Assignment.objects.all()
     serializer_class = AssignmentSerializer
     filterset_class = None
@@ -33,7 +36,7 @@ class AssignmentViewSet(views.ModelViewSet):
     resource_name = "assignment"
 
 
-class ContestViewSet(views.ModelViewSet):
+class ContestViewSet(ConditionalMixin, views.ModelViewSet):
     queryset = Contest.objects.all()
     serializer_class = ContestSerializer
     filterset_class = None
@@ -44,7 +47,7 @@ class ContestViewSet(views.ModelViewSet):
     resource_name = "contest"
 
 
-class EntryViewSet(views.ModelViewSet):
+class EntryViewSet(ConditionalMixin, views.ModelViewSet):
     queryset = Entry.objects.all()
     prefetch_for_includes = {
         '__all__': [],
@@ -128,7 +131,7 @@ class EntryViewSet(views.ModelViewSet):
         return Response(serializer.data)
 
 
-class SessionViewSet(views.ModelViewSet):
+class SessionViewSet(ConditionalMixin, views.ModelViewSet):
     queryset = Session.objects.prefetch_related(
         'entries',
         'assignments',
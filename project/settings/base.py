@@ -193,6 +193,7 @@ ALGOLIA = {
     'APPLICATION_ID': get_env_variable("ALGOLIASEARCH_APPLICATION_ID"),
     'API_KEY': get_env_variable("ALGOLIASEARCH_API_KEY"),
     'AUTO_INDEXING': False,
+    'DEFERRED_INDEXING': False,
 }
 
 # Cloudinary
@@ -32,7 +32,7 @@ EMAIL_BACKEND = "sendgrid_backend.SendgridBackend"
 SENDGRID_API_KEY = get_env_variable("SENDGRID_API_KEY")
 
 # Search
-ALGOLIA['AUTO_INDEXING'] = True
+ALGOLIA['DEFERRED_INDEXING'] = True
 
 # Logging
 LOGGING = {